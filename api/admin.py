@@ -1,7 +1,23 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from clients.utils.exceptions import SWAPIClientError
 
 # Register your models here.
-from .models import Character, Film, Starship, Vote
+from .models import Character, Film, Starship, SyncRun, Vote
+from .swapi_service import SWAPIService
+
+
+@admin.action(description="Re-sync selected items from SWAPI")
+def resync_from_swapi(modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet) -> None:
+    """Refresh only the selected rows (and their relations) from their SWAPI detail endpoints."""
+    try:
+        results = SWAPIService().resync_urls(queryset.values_list("swapi_url", flat=True))
+    except (SWAPIClientError, ValueError) as exc:
+        modeladmin.message_user(request, f"SWAPI re-sync failed: {exc}", messages.ERROR)
+        return
+    modeladmin.message_user(request, "; ".join(str(result) for result in results), messages.SUCCESS)
 
 
 @admin.register(Character)
@@ -9,6 +25,7 @@ class CharacterAdmin(admin.ModelAdmin):
     list_display = ("name", "swapi_url")
     search_fields = ("name", "swapi_url")
     list_filter = ("films", "starships")
+    actions = (resync_from_swapi,)
 
 
 @admin.register(Film)
@@ -16,6 +33,7 @@ class FilmAdmin(admin.ModelAdmin):
     list_display = ("title", "swapi_url", "release_date")
     search_fields = ("title", "swapi_url")
     list_filter = ("release_date",)
+    actions = (resync_from_swapi,)
 
 
 @admin.register(Starship)
@@ -23,6 +41,7 @@ class StarshipAdmin(admin.ModelAdmin):
     list_display = ("name", "swapi_url")
     search_fields = ("name", "swapi_url")
     list_filter = ("name",)
+    actions = (resync_from_swapi,)
 
 
 @admin.register(Vote)
@@ -31,3 +50,10 @@ class VoteAdmin(admin.ModelAdmin):
     search_fields = ("user__username", "character__name", "film__title", "starship__name")
     list_filter = ("created_at",)
     raw_id_fields = ("user", "character", "film", "starship")
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = ("started_at", "status", "duration", "host")
+    list_filter = ("status",)
+    readonly_fields = ("started_at", "finished_at", "status", "duration", "host", "results", "error")
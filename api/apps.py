@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self) -> None:
+        # Connect the signal receivers that invalidate cached list counts and responses
+        from api import list_counts, response_cache  # noqa: F401
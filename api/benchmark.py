@@ -0,0 +1,153 @@
+"""
+End-to-end SWAPI ingestion benchmarks against a local fake SWAPI server serving synthetic datasets.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import connection
+from django.test.utils import override_settings
+
+from api.models import Character, Film, Starship, SyncCheckpoint
+from api.swapi_service import SWAPIService, build_swapi_client
+from clients.fake_server import FakeSWAPIServerProcess
+
+BENCHMARK_MODES: Dict[str, Callable[[SWAPIService], Any]] = {
+    "sync": lambda service: [
+        service.fetch_and_store_films(),
+        service.fetch_and_store_starships(),
+        service.fetch_and_store_characters(),
+    ],
+    "stream": lambda service: [service.stream_and_store(resource) for resource in ("films", "starships", "people")],
+    "parallel": lambda service: service.sync_orchestrated(),
+    "staged": lambda service: service.stage_and_publish(service.fetch_resources()),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """One benchmark run: the rows ingested and what it cost."""
+
+    mode: str
+    characters: int
+    rows: int
+    wall_time: float
+    queries: int  # issued on the benchmarking thread
+    peak_memory: int  # peak traced Python allocations, in bytes
+    requests: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.mode}:{self.characters}"
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.wall_time if self.wall_time else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "wall_time_s": round(self.wall_time, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "queries": self.queries,
+            "peak_memory_bytes": self.peak_memory,
+            "requests": self.requests,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.key}: {self.rows} rows in {self.wall_time:.2f}s ({self.rows_per_second:.0f} rows/s), "
+            f"{self.queries} queries, peak memory {self.peak_memory / 2**20:.1f} MiB, {self.requests} requests"
+        )
+
+
+def run_benchmark(
+    characters: int, mode: str = "sync", page_size: int = 10, latency: float = 0.0, workers: Optional[int] = None
+) -> BenchmarkResult:
+    """
+    Sync a synthetic dataset of `characters` people (plus scaled films and starships) from a fake SWAPI server
+    into empty SWAPI tables with the `mode` code path. Runs against whatever database is configured, so callers
+    are expected to point it at a throwaway one.
+    """
+    reset_sync_tables()
+    queries = 0
+
+    def count_query(execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    isolated = override_settings(
+        SWAPI_RATE_LIMIT=0, SWAPI_MAX_RETRIES=0, SWAPI_CIRCUIT_BREAKER_THRESHOLD=0, SWAPI_HTTP_CACHE_DIR=""
+    )
+    with FakeSWAPIServerProcess(characters, page_size=page_size, latency=latency) as server, isolated:
+        service = SWAPIService()
+        service.client = build_swapi_client(max_workers=workers)
+        service.client.BASE_URL = server.base_url
+
+        tracemalloc.start()
+        started_at = time.perf_counter()
+        try:
+            with connection.execute_wrapper(count_query):
+                BENCHMARK_MODES[mode](service)
+            wall_time = time.perf_counter() - started_at
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult(
+        mode=mode,
+        characters=characters,
+        rows=Film.objects.count() + Starship.objects.count() + Character.objects.count(),
+        wall_time=wall_time,
+        queries=queries,
+        peak_memory=peak_memory,
+        requests=service.client.stats.requests,
+    )
+
+
+def reset_sync_tables() -> None:
+    for model in (Character, Film, Starship, SyncCheckpoint):
+        model.objects.all().delete()
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: List[BenchmarkResult]) -> None:
+    """Merge `results` into the baseline file at `path`, keyed by mode and dataset size."""
+    baseline = load_baseline(path)
+    baseline.update({result.key: result.as_dict() for result in results})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def compare_to_baseline(result: BenchmarkResult, baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """Describe every metric of `result` that is worse than its baseline by more than `threshold` (0.2 = 20%)."""
+    expected = baseline.get(result.key)
+    if not expected:
+        return []
+
+    regressions = []
+    if result.rows_per_second < expected["rows_per_second"] * (1 - threshold):
+        regressions.append(
+            f"{result.key}: throughput {result.rows_per_second:.0f} rows/s "
+            f"vs baseline {expected['rows_per_second']:.0f}"
+        )
+    if result.queries > expected["queries"] * (1 + threshold):
+        regressions.append(f"{result.key}: {result.queries} queries vs baseline {expected['queries']}")
+    if result.peak_memory > expected["peak_memory_bytes"] * (1 + threshold):
+        regressions.append(
+            f"{result.key}: peak memory {result.peak_memory} B vs baseline {expected['peak_memory_bytes']} B"
+        )
+    return regressions
@@ -0,0 +1,28 @@
+"""
+Generation numbers for invalidating whole families of cache entries at once.
+
+Cache keys embed the current generation of their family; bumping it orphans every entry of the previous
+generation, which then simply expires. This works on every Django cache backend, including those (local
+memory, files) that cannot delete keys by pattern.
+"""
+
+import time
+
+from django.core.cache import cache
+
+
+def get_generation(key: str) -> int:
+    generation = cache.get(key)
+    if generation is None:
+        # Seeded from the clock so that a generation evicted from the cache never comes back with an old value
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation if generation is not None else time.time_ns()
+
+
+def bump_generation(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not stored (yet, or any more): starting a fresh one is just as good
+        cache.add(key, time.time_ns(), timeout=None)
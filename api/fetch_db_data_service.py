@@ -1,35 +1,136 @@
-from typing import Any, Dict, Optional, Type, TypeVar
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.db import DatabaseError
-from django.db.models import Model
+from django.db.models import Count, IntegerField, Model, OuterRef, Prefetch, Q, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 
-from api.models import Character, Film, Starship
+from api.list_counts import list_count
+from api.models import Character, Film, Starship, Vote
 
 T = TypeVar("T", bound=Model)
 
 
+def vote_count(vote_field: str) -> Coalesce:
+    """
+    Vote total of each row as a correlated subquery on the vote's `vote_field` foreign key. Unlike a joined
+    Count("vote"), it needs no GROUP BY over the outer query, so an ordered (sort key, id) index scan can stop
+    at the page's LIMIT instead of aggregating the whole table first.
+    """
+    votes = (
+        Vote.objects.filter(**{vote_field: OuterRef("pk")})
+        .order_by()
+        .values(vote_field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(votes, output_field=IntegerField()), 0)
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """
+    How list pages of one model are queried: searched field, annotations, prefetches and deferred fields.
+    Cursor pages are ordered by (`sort_key`, id), which each model backs with a composite index.
+    """
+
+    search_field: str
+    sort_key: str
+    annotations: Dict[str, Any]
+    prefetches: List[Prefetch] = field(default_factory=list)
+    # Columns the API never serializes
+    deferred: Tuple[str, ...] = ("content_hash",)
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        return queryset.annotate(**self.annotations).prefetch_related(*self.prefetches).defer(*self.deferred)
+
+
+FILM_PLAN = QueryPlan(search_field="title", sort_key="title", annotations={"vote_count": vote_count("film")})
+STARSHIP_PLAN = QueryPlan(search_field="name", sort_key="name", annotations={"vote_count": vote_count("starship")})
+# Nested films and starships are fetched with one query each, with their own vote totals
+CHARACTER_PLAN = QueryPlan(
+    search_field="name",
+    sort_key="name",
+    annotations={"vote_count": vote_count("character")},
+    prefetches=[
+        Prefetch("films", queryset=FILM_PLAN.apply(Film.objects.all())),
+        Prefetch("starships", queryset=STARSHIP_PLAN.apply(Starship.objects.all())),
+    ],
+)
+QUERY_PLANS: Dict[Type[Model], QueryPlan] = {Film: FILM_PLAN, Starship: STARSHIP_PLAN, Character: CHARACTER_PLAN}
+
+
 class DatabaseServiceException(Exception):
     """Base exception for database service errors."""
 
     pass
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+def encode_cursor(sort_value: Any, pk: int, backwards: bool = False) -> str:
+    """Opaque cursor pointing just after (or, going backwards, just before) the row (sort_value, pk)."""
+    payload = json.dumps([sort_value, pk, backwards], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int, bool]:
+    try:
+        sort_value, pk, backwards = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(pk, int) or not isinstance(backwards, bool):
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    return sort_value, pk, backwards
+
+
+class KnownCountPaginator(Paginator):
+    """Paginator whose total comes from list_count (cached or estimated) instead of its own COUNT(*)."""
+
+    def __init__(self, object_list: QuerySet, per_page: int, count: int) -> None:
+        super().__init__(object_list, per_page)
+        self._known_count = count
+
+    @cached_property
+    def count(self) -> int:
+        return self._known_count
+
+
 class FetchDBDataService:
     PAGE_SIZE = 10
 
+    @staticmethod
+    def get_queryset(model_class: Type[T]) -> QuerySet:
+        """
+        Queryset for list pages built from the model's QueryPlan. Vote totals are annotated as `vote_count` (read
+        by the models' `votes`), so serializing a page costs a fixed number of queries whatever its size.
+        """
+        return QUERY_PLANS[model_class].apply(model_class.objects.all())
+
     @staticmethod
     def get_paginated_data(model_class: Type[T], page: int = 1, search_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Retrieve paginated data for the given model with optional search.
         """
         try:
-            queryset = model_class.objects.all()
+            queryset = FetchDBDataService.get_queryset(model_class)
+            search_filter = {}
             if search_query:
-                search_field = "name" if model_class == Character else "title" if model_class == Film else "name"
-                queryset = queryset.filter(**{f"{search_field}__icontains": search_query})
+                search_filter = {f"{QUERY_PLANS[model_class].search_field}__icontains": search_query}
+                queryset = queryset.filter(**search_filter)
 
-            paginator = Paginator(queryset, FetchDBDataService.PAGE_SIZE)
+            # Count the bare filtered table, without the page query's annotations and prefetches
+            count, estimated = list_count(model_class, model_class.objects.filter(**search_filter), search_query)
+            paginator = KnownCountPaginator(queryset.order_by("pk"), FetchDBDataService.PAGE_SIZE, count)
             try:
                 page_obj = paginator.page(page)
             except PageNotAnInteger:
@@ -42,22 +143,74 @@ class FetchDBDataService:
                 "total_pages": paginator.num_pages,
                 "current_page": page_obj.number,
                 "total_items": paginator.count,
+                "estimated": estimated,
             }
 
         except DatabaseError as e:
             raise DatabaseServiceException(f"Database error occurred: {str(e)}")
 
+    @staticmethod
+    def get_cursor_data(model_class: Type[T], cursor: str = "", search_query: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Retrieve one keyset page for the given model: rows after (or before) the cursor position in
+        (sort key, id) order, without COUNT or OFFSET. An empty cursor starts at the first page. Rows
+        inserted or updated by a concurrent sync never shift the rows of pages already handed out.
+        """
+        plan = QUERY_PLANS[model_class]
+        key = plan.sort_key
+        page_size = FetchDBDataService.PAGE_SIZE
+        try:
+            queryset = FetchDBDataService.get_queryset(model_class)
+            if search_query:
+                queryset = queryset.filter(**{f"{plan.search_field}__icontains": search_query})
+
+            backwards = False
+            if cursor:
+                sort_value, pk, backwards = decode_cursor(cursor)
+                op = "lt" if backwards else "gt"
+                queryset = queryset.filter(Q(**{f"{key}__{op}": sort_value}) | Q(**{key: sort_value, f"pk__{op}": pk}))
+            ordering = (f"-{key}", "-pk") if backwards else (key, "pk")
+
+            # One extra row tells whether there is a page beyond this one
+            items = list(queryset.order_by(*ordering)[: page_size + 1])
+            has_more = len(items) > page_size
+            items = items[:page_size]
+            if backwards:
+                items.reverse()
+        except DatabaseError as e:
+            raise DatabaseServiceException(f"Database error occurred: {str(e)}")
+
+        has_next, has_prev = (True, has_more) if backwards else (has_more, bool(cursor))
+        first, last = (items[0], items[-1]) if items else (None, None)
+        return {
+            "items": items,
+            "next": encode_cursor(getattr(last, key), last.pk) if has_next and last else None,
+            "prev": encode_cursor(getattr(first, key), first.pk, backwards=True) if has_prev and first else None,
+        }
+
     @classmethod
-    def get_characters(cls, page: int = 1, search_query: Optional[str] = None) -> Dict[str, Any]:
-        """Get paginated characters with optional search."""
+    def get_characters(
+        cls, page: int = 1, search_query: Optional[str] = None, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get paginated characters with optional search; a cursor (even empty) selects cursor pagination."""
+        if cursor is not None:
+            return cls.get_cursor_data(Character, cursor, search_query)
         return cls.get_paginated_data(Character, page, search_query)
 
     @classmethod
-    def get_films(cls, page: int = 1, search_query: Optional[str] = None) -> Dict[str, Any]:
-        """Get paginated films with optional search."""
+    def get_films(
+        cls, page: int = 1, search_query: Optional[str] = None, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get paginated films with optional search; a cursor (even empty) selects cursor pagination."""
+        if cursor is not None:
+            return cls.get_cursor_data(Film, cursor, search_query)
         return cls.get_paginated_data(Film, page, search_query)
 
     @classmethod
-    def get_starships(cls, page: int = 1, search_query: Optional[str] = None) -> Dict[str, Any]:
-        """Get paginated starships with optional search."""
+    def get_starships(
+        cls, page: int = 1, search_query: Optional[str] = None, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get paginated starships with optional search; a cursor (even empty) selects cursor pagination."""
+        if cursor is not None:
+            return cls.get_cursor_data(Starship, cursor, search_query)
         return cls.get_paginated_data(Starship, page, search_query)
@@ -0,0 +1,68 @@
+"""
+Totals for the page-number metadata of list endpoints (`total_items`, `total_pages`).
+
+Exact counts are cached per model and search term under a generation number that is bumped whenever a SWAPI
+sync commits or a film, starship or character is saved or deleted through the ORM. Bulk writes outside the sync
+are covered by API_LIST_COUNT_CACHE_TIMEOUT. Invalidation reaches other processes only through a shared cache
+backend (CACHES), so without one the timeout defaults to 0 and every request counts. With
+API_LIST_COUNT_ESTIMATE on PostgreSQL, unfiltered lists use the planner's row estimate from pg_class instead of
+COUNT(*).
+"""
+
+import hashlib
+from typing import Any, Optional, Tuple, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Model, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache_generations import bump_generation, get_generation
+from api.models import Character, Film, Starship
+from api.signals import swapi_sync_finished
+
+GENERATION_KEY = "list-counts:generation"
+
+
+@receiver(swapi_sync_finished)
+@receiver([post_save, post_delete], sender=Film)
+@receiver([post_save, post_delete], sender=Starship)
+@receiver([post_save, post_delete], sender=Character)
+def invalidate_list_counts(**kwargs: Any) -> None:
+    """Orphan every cached count by moving to a new generation."""
+    bump_generation(GENERATION_KEY)
+
+
+def estimated_count(model_class: Type[Model]) -> Optional[int]:
+    """Planner row estimate of the model's table on PostgreSQL; None elsewhere or before the table is analyzed."""
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [model_class._meta.db_table])
+        row = cursor.fetchone()
+    # Never analyzed reads -1 since PostgreSQL 14 but 0 before it, so an estimate of 0 cannot be trusted either
+    return int(row[0]) if row and row[0] > 0 else None
+
+
+def list_count(model_class: Type[Model], queryset: QuerySet, search_query: Optional[str] = None) -> Tuple[int, bool]:
+    """
+    Number of rows of `queryset` (the model's list, filtered by `search_query`) and whether it is an estimate.
+    """
+    if not search_query and getattr(settings, "API_LIST_COUNT_ESTIMATE", False):
+        estimate = estimated_count(model_class)
+        if estimate is not None:
+            return estimate, True
+
+    timeout = getattr(settings, "API_LIST_COUNT_CACHE_TIMEOUT", 0)
+    if not timeout:
+        return queryset.count(), False
+
+    search_key = hashlib.sha256((search_query or "").encode()).hexdigest()[:16]
+    key = f"list-counts:{get_generation(GENERATION_KEY)}:{model_class._meta.label_lower}:{search_key}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=timeout)
+    return count, False
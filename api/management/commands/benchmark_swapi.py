@@ -0,0 +1,80 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+
+from api.benchmark import BENCHMARK_MODES, compare_to_baseline, load_baseline, run_benchmark, save_baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark SWAPI ingestion end to end against a local fake SWAPI server with synthetic datasets, "
+        "in a throwaway test database, and compare the results with a baseline file."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1000],
+            metavar="CHARACTERS",
+            help="Number of synthetic characters per run, e.g. --sizes 1000 10000 100000 (default: 1000).",
+        )
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=sorted(BENCHMARK_MODES),
+            default=["sync"],
+            help="Sync code paths to benchmark (default: sync).",
+        )
+        parser.add_argument("--page-size", type=int, default=10, help="Items per fake SWAPI page (default: 10).")
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Seconds the fake server waits before each response."
+        )
+        parser.add_argument("--workers", type=int, default=None, help="Fetch threads (default: SWAPI_FETCH_WORKERS).")
+        parser.add_argument(
+            "--baseline",
+            default="benchmarks/swapi_baseline.json",
+            help="Baseline file to compare against (default: benchmarks/swapi_baseline.json).",
+        )
+        parser.add_argument(
+            "--update-baseline", action="store_true", help="Record this run's results in the baseline file."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Fail when throughput, query count or peak memory is worse than the baseline by more than this "
+            "fraction (default: 0.2).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        baseline = load_baseline(options["baseline"])
+        results, regressions = [], []
+
+        # Never touch the configured database: run every benchmark in a fresh test database
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for characters in options["sizes"]:
+                for mode in options["modes"]:
+                    result = run_benchmark(
+                        characters,
+                        mode=mode,
+                        page_size=options["page_size"],
+                        latency=options["latency"],
+                        workers=options["workers"],
+                    )
+                    self.stdout.write(str(result))
+                    results.append(result)
+                    regressions.extend(compare_to_baseline(result, baseline, options["threshold"]))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options["update_baseline"]:
+            save_baseline(options["baseline"], results)
+            self.stdout.write(f"Baseline written to {options['baseline']}")
+        if regressions:
+            raise CommandError("Performance regressions against the baseline:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("SWAPI ingestion benchmark complete!"))
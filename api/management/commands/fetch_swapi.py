@@ -1,22 +1,254 @@
-from typing import Any
+import json
+from itertools import combinations
+from typing import Any, Dict, List, Optional
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError, CommandParser, OutputWrapper
 
-from api.swapi_service import SWAPIService
+from api.snapshot import SnapshotError, read_snapshot
+from api.staging import StagingValidationError
+from api.swapi_service import SWAPIService, SyncResult, build_swapi_client
+from api.sync_profiler import SyncProfiler
+
+# Sync mode options (option dest -> flag) and the other mode options each one can be combined with; any other
+# combination would silently ignore one of the flags
+SYNC_MODE_FLAGS = {
+    "urls": "--url",
+    "staged": "--staged",
+    "from_snapshot": "--from-snapshot",
+    "export_snapshot": "--export-snapshot",
+    "parallel": "--parallel",
+    "use_async": "--async",
+    "stream": "--stream",
+    "resume": "--resume",
+}
+COMPATIBLE_SYNC_MODES = {
+    frozenset({"staged", "from_snapshot"}),
+    frozenset({"staged", "use_async"}),
+    frozenset({"export_snapshot", "use_async"}),
+    frozenset({"parallel", "use_async"}),
+    frozenset({"stream", "resume"}),
+}
 
 
 class Command(BaseCommand):
     help = "Fetch and sync SWAPI data (films, characters, starships) into the database."
+    # Set by BaseCommand.execute; swapped for stderr while the JSON report goes to stdout
+    stdout: OutputWrapper
 
     def __init__(self) -> None:
         super().__init__()
         self.service = SWAPIService()
 
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of threads used to fetch SWAPI pages concurrently (1 fetches pages sequentially).",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            metavar="SWAPI_URL",
+            help="Only re-sync the film, starship or character at this SWAPI URL (repeatable).",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Stream pages and commit them in chunks of SWAPI_SYNC_BATCH_SIZE rows, bounding memory use.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted streaming sync from the last committed page of each resource.",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_async",
+            help="Download films, starships and characters concurrently with asyncio before writing to the database.",
+        )
+        parser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Download all resources in parallel, apply films and starships concurrently, then characters, "
+            "and print how long each phase took.",
+        )
+        parser.add_argument(
+            "--staged",
+            action="store_true",
+            help="Load the data into staging tables, validate it there and publish it in one short transaction "
+            "(combine with --from-snapshot to stage a snapshot).",
+        )
+        parser.add_argument(
+            "--metrics-json",
+            metavar="PATH",
+            help="Write a JSON report of per-phase timings, row and query counts and HTTP stats to PATH "
+            "('-' for stdout).",
+        )
+        parser.add_argument(
+            "--profile",
+            nargs="?",
+            const="swapi_profile",
+            metavar="DIR",
+            help="Run the sync under cProfile and tracemalloc and write hot-function and allocation reports for "
+            "the fetch, apply and M2M sections to DIR (default: swapi_profile). Pages are fetched sequentially.",
+        )
+        snapshot = parser.add_mutually_exclusive_group()
+        snapshot.add_argument(
+            "--export-snapshot",
+            metavar="PATH",
+            help="Also write the raw SWAPI payloads to a compressed snapshot file at PATH.",
+        )
+        snapshot.add_argument(
+            "--from-snapshot",
+            metavar="PATH",
+            help="Load the data from a snapshot written by --export-snapshot instead of calling SWAPI.",
+        )
+
     def handle(self, *args: Any, **options: Any) -> None:
-        self.stdout.write("Syncing Films...")
-        self.service.fetch_and_store_films()
-        self.stdout.write("Syncing Starships...")
-        self.service.fetch_and_store_starships()
-        self.stdout.write("Syncing Characters...")
-        self.service.fetch_and_store_characters()
-        self.stdout.write(self.style.SUCCESS("SWAPI data sync complete!"))
+        self._check_sync_modes(options)
+        if options["profile"] and options["parallel"]:
+            raise CommandError("--profile cannot follow the worker threads of --parallel")
+        if options["profile"] and options["workers"] is not None:
+            raise CommandError("--profile fetches pages sequentially and cannot be combined with --workers")
+        if options["profile"]:
+            # cProfile only sees the calling thread, so fetch pages there
+            self.service.client = build_swapi_client(max_workers=1)
+        elif options["workers"] is not None:
+            # Rebuild the client so its connection pool is sized for the requested concurrency
+            self.service.client = build_swapi_client(max_workers=max(options["workers"], 1))
+
+        report_stdout = self.stdout
+        if options["metrics_json"] == "-":
+            # stdout carries only the JSON report; progress goes to stderr (unstyled, it is not an error)
+            self.stdout = OutputWrapper(self.stderr._out)
+        try:
+            results = self._sync_with_profile(options)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"HTTP: {self.service.client.stats}")
+            if options["metrics_json"]:
+                self._write_metrics(options["metrics_json"], results, report_stdout)
+            self.stdout.write(self.style.SUCCESS("SWAPI data sync complete!"))
+        finally:
+            self.stdout = report_stdout
+
+    def _sync_with_profile(self, options: Dict[str, Any]) -> List[SyncResult]:
+        profiler = SyncProfiler() if options["profile"] else None
+        if profiler:
+            self.service.metrics.profiler = profiler
+            profiler.start()
+        try:
+            results = self._run_sync(options)
+        finally:
+            if profiler:
+                profiler.stop()
+                self.service.metrics.profiler = None
+        if profiler:
+            for path in profiler.write_report(options["profile"]):
+                self.stdout.write(f"Profile written to {path}")
+        return results
+
+    def _check_sync_modes(self, options: Dict[str, Any]) -> None:
+        selected = [dest for dest in SYNC_MODE_FLAGS if options[dest]]
+        for first, second in combinations(selected, 2):
+            if frozenset({first, second}) not in COMPATIBLE_SYNC_MODES:
+                raise CommandError(f"{SYNC_MODE_FLAGS[first]} cannot be combined with {SYNC_MODE_FLAGS[second]}")
+
+    def _run_sync(self, options: Dict[str, Any]) -> List[SyncResult]:
+        if options["urls"]:
+            return self._sync_urls(options["urls"])
+        if options["staged"]:
+            return self._sync_staged(options["from_snapshot"], use_async=options["use_async"])
+        if options["from_snapshot"]:
+            return self._sync_from_snapshot(options["from_snapshot"])
+        if options["export_snapshot"]:
+            return self._sync_and_export(options["export_snapshot"], use_async=options["use_async"])
+        if options["parallel"]:
+            return self._sync_parallel(use_async=options["use_async"])
+        if options["use_async"]:
+            return self._sync_async()
+        if options["stream"] or options["resume"]:
+            return self._sync_streaming(resume=options["resume"])
+        return self._sync()
+
+    def _sync(self) -> List[SyncResult]:
+        results = []
+        for label, sync in (
+            ("Films", self.service.fetch_and_store_films),
+            ("Starships", self.service.fetch_and_store_starships),
+            ("Characters", self.service.fetch_and_store_characters),
+        ):
+            self.stdout.write(f"Syncing {label}...")
+            results.append(sync())
+            self.stdout.write(str(results[-1]))
+        return results
+
+    def _sync_async(self) -> List[SyncResult]:
+        self.stdout.write("Fetching Films, Starships and Characters concurrently...")
+        return self._write_results(self.service.fetch_and_store_all_async())
+
+    def _sync_parallel(self, use_async: bool) -> List[SyncResult]:
+        self.stdout.write("Syncing Films, Starships and Characters in parallel...")
+        report = self.service.sync_orchestrated(use_async=use_async)
+        self._write_results(report.results)
+        for phase, seconds in report.timings.items():
+            self.stdout.write(f"  {phase}: {seconds:.2f}s")
+        self.stdout.write(f"  total: {sum(report.timings.values()):.2f}s")
+        return report.results
+
+    def _sync_urls(self, urls: List[str]) -> List[SyncResult]:
+        self.stdout.write(f"Re-syncing {len(urls)} SWAPI item(s)...")
+        try:
+            results = self.service.resync_urls(urls)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        return self._write_results(results)
+
+    def _sync_staged(self, snapshot_path: Optional[str], use_async: bool) -> List[SyncResult]:
+        try:
+            if snapshot_path:
+                self.stdout.write(f"Staging snapshot {snapshot_path}...")
+                resources_data = read_snapshot(snapshot_path)
+            else:
+                self.stdout.write("Fetching Films, Starships and Characters into staging...")
+                resources_data = self.service.fetch_resources(use_async=use_async)
+            results = self.service.stage_and_publish(resources_data)
+        except (SnapshotError, StagingValidationError) as exc:
+            raise CommandError(str(exc)) from exc
+        return self._write_results(results)
+
+    def _sync_from_snapshot(self, path: str) -> List[SyncResult]:
+        self.stdout.write(f"Loading snapshot {path}...")
+        try:
+            results = self.service.load_snapshot(path)
+        except SnapshotError as exc:
+            raise CommandError(str(exc)) from exc
+        return self._write_results(results)
+
+    def _sync_and_export(self, path: str, use_async: bool) -> List[SyncResult]:
+        self.stdout.write(f"Fetching Films, Starships and Characters into snapshot {path}...")
+        return self._write_results(self.service.export_snapshot(path, use_async=use_async))
+
+    def _sync_streaming(self, resume: bool) -> List[SyncResult]:
+        results = []
+        for resource, label in (("films", "Films"), ("starships", "Starships"), ("people", "Characters")):
+            self.stdout.write(f"Streaming {label}...")
+            results.append(self.service.stream_and_store(resource, resume=resume))
+            self.stdout.write(str(results[-1]))
+        return results
+
+    def _write_results(self, results: List[SyncResult]) -> List[SyncResult]:
+        for result in results:
+            self.stdout.write(str(result))
+        return results
+
+    def _write_metrics(self, path: str, results: List[SyncResult], stdout: OutputWrapper) -> None:
+        report = json.dumps(self.service.metrics_report(results), indent=2)
+        if path == "-":
+            stdout.write(report)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        self.stdout.write(f"Metrics written to {path}")
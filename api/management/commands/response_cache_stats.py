@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from api.response_cache import reset_response_cache_stats, response_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hits, misses and hit rate of the list response cache per resource."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not getattr(settings, "API_RESPONSE_CACHE_TIMEOUT", 0):
+            self.stderr.write("The response cache is disabled (API_RESPONSE_CACHE_TIMEOUT=0).")
+        for resource, stats in response_cache_stats().items():
+            self.stdout.write(
+                f"{resource}: {stats['hits']} hits, {stats['misses']} misses, hit rate {stats['hit_rate']:.1%}"
+            )
+        if options["reset"]:
+            reset_response_cache_stats()
+            self.stdout.write("Counters reset.")
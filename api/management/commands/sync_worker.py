@@ -0,0 +1,69 @@
+import signal
+import threading
+import time
+from typing import Any, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from api.models import SyncRun
+from api.swapi_service import SWAPIService, SyncResult
+from api.sync_worker import run_scheduled_sync, run_sync
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh SWAPI data on an interval. Only the node holding the database sync lock syncs; the others skip "
+        "the run. Every run's status and duration is recorded as a SyncRun."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Seconds between the starts of two runs (default: SWAPI_SYNC_INTERVAL).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run (or skip, if another node is syncing) a single sync and exit, e.g. from cron.",
+        )
+        parser.add_argument(
+            "--staged",
+            action="store_true",
+            help="Sync through the staging tables and publish in one short transaction.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        interval = options["interval"]
+        if interval is None:
+            interval = getattr(settings, "SWAPI_SYNC_INTERVAL", 3600)
+        stopping = threading.Event()
+
+        if not options["once"]:
+            # Finish the current run on SIGTERM/SIGINT instead of dying with the sync lock held mid-transaction
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: stopping.set())
+
+        while not stopping.is_set():
+            started_at = time.monotonic()
+            self._run_once(options["staged"])
+            if options["once"]:
+                break
+            close_old_connections()
+            stopping.wait(max(0.0, interval - (time.monotonic() - started_at)))
+        self.stdout.write("SWAPI sync worker stopped.")
+
+    def _run_once(self, staged: bool) -> None:
+        def sync() -> List[SyncResult]:
+            return run_sync(SWAPIService(), staged=staged)
+
+        run = run_scheduled_sync(sync)
+        if run is None:
+            self.stdout.write("Another node holds the SWAPI sync lock; skipping this run.")
+        elif run.status == SyncRun.SUCCEEDED:
+            self.stdout.write(self.style.SUCCESS(f"SWAPI sync succeeded in {run.duration:.2f}s."))
+        else:
+            self.stderr.write(f"SWAPI sync failed after {run.duration:.2f}s:\n{run.error}")
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_sync_checkpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StagedCharacter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("swapi_url", models.URLField(unique=True)),
+                ("data", models.JSONField()),
+                ("content_hash", models.CharField(max_length=64)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StagedCharacterFilm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("character_url", models.URLField(db_index=True)),
+                ("film_url", models.URLField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StagedCharacterStarship",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("character_url", models.URLField(db_index=True)),
+                ("starship_url", models.URLField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StagedFilm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("swapi_url", models.URLField(unique=True)),
+                ("release_date", models.DateField()),
+                ("data", models.JSONField()),
+                ("content_hash", models.CharField(max_length=64)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StagedStarship",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("swapi_url", models.URLField(unique=True)),
+                ("data", models.JSONField()),
+                ("content_hash", models.CharField(max_length=64)),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_sync_runs"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="character",
+            index=models.Index(fields=["name", "id"], name="character_name_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="film",
+            index=models.Index(fields=["title", "id"], name="film_title_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="starship",
+            index=models.Index(fields=["name", "id"], name="starship_name_id_idx"),
+        ),
+    ]
@@ -2,32 +2,52 @@ from django.conf import settings
 from django.db import models
 
 
+def _count_votes(item: models.Model) -> int:
+    """
+    Vote total of a film, starship or character. List queries annotate `vote_count` (see FetchDBDataService) so
+    that serializing a page does not issue one COUNT per row; other instances fall back to counting.
+    """
+    annotated = getattr(item, "vote_count", None)
+    return annotated if annotated is not None else item.vote_set.count()
+
+
 class Film(models.Model):
     title = models.CharField(max_length=255)
     swapi_url = models.URLField(unique=True)
     release_date = models.DateField()
     data = models.JSONField()  # Stores the full SWAPI film response as JSON
+    content_hash = models.CharField(max_length=64, blank=True, default="")  # SHA-256 of `data`, to skip no-op syncs
+
+    class Meta:
+        # Keyset pagination of list pages walks (title, id)
+        indexes = [models.Index(fields=["title", "id"], name="film_title_id_idx")]
 
     def __str__(self) -> str:
         return self.title
 
     @property
     def votes(self) -> int:
-        return self.vote_set.count()
+        """Returns the total number of votes for this film, from the `vote_count` annotation when present."""
+        return _count_votes(self)
 
 
 class Starship(models.Model):
     name = models.CharField(max_length=255)
     swapi_url = models.URLField(unique=True)
     data = models.JSONField()  # Stores the full SWAPI starship response as JSON
+    content_hash = models.CharField(max_length=64, blank=True, default="")  # SHA-256 of `data`, to skip no-op syncs
+
+    class Meta:
+        # Keyset pagination of list pages walks (name, id)
+        indexes = [models.Index(fields=["name", "id"], name="starship_name_id_idx")]
 
     def __str__(self) -> str:
         return self.name
 
     @property
     def votes(self) -> int:
-        """Returns the total number of votes for this starship."""
-        return self.vote_set.count()
+        """Returns the total number of votes for this starship, from the `vote_count` annotation when present."""
+        return _count_votes(self)
 
 
 class Character(models.Model):
@@ -36,14 +56,19 @@ class Character(models.Model):
     films = models.ManyToManyField(Film, related_name="characters")
     starships = models.ManyToManyField(Starship, related_name="characters", blank=True)
     data = models.JSONField()  # Stores the full SWAPI character response as JSON
+    content_hash = models.CharField(max_length=64, blank=True, default="")  # SHA-256 of `data`, to skip no-op syncs
+
+    class Meta:
+        # Keyset pagination of list pages walks (name, id)
+        indexes = [models.Index(fields=["name", "id"], name="character_name_id_idx")]
 
     def __str__(self) -> str:
         return self.name
 
     @property
     def votes(self) -> int:
-        """Returns the total number of votes for this character."""
-        return self.vote_set.count()
+        """Returns the total number of votes for this character, from the `vote_count` annotation when present."""
+        return _count_votes(self)
 
 
 class Vote(models.Model):
@@ -60,3 +85,88 @@ class Vote(models.Model):
             models.UniqueConstraint(fields=["user", "film"], name="unique_user_film_vote"),
             models.UniqueConstraint(fields=["user", "starship"], name="unique_user_starship_vote"),
         ]
+
+
+class SyncCheckpoint(models.Model):
+    """Last page of a SWAPI resource committed by a streaming sync, so an interrupted sync can resume."""
+
+    resource = models.CharField(max_length=32, unique=True)
+    last_page = models.PositiveIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        status = "completed" if self.completed else f"page {self.last_page}"
+        return f"{self.resource}: {status}"
+
+
+# Shadow tables for staged syncs: a large refresh is loaded and validated here, then merged into the live tables
+# above in one short transaction. Rows are keyed by SWAPI URL, so live primary keys (and Vote FKs) never change.
+
+
+class StagedFilm(models.Model):
+    title = models.CharField(max_length=255)
+    swapi_url = models.URLField(unique=True)
+    release_date = models.DateField()
+    data = models.JSONField()
+    content_hash = models.CharField(max_length=64)
+
+
+class StagedStarship(models.Model):
+    name = models.CharField(max_length=255)
+    swapi_url = models.URLField(unique=True)
+    data = models.JSONField()
+    content_hash = models.CharField(max_length=64)
+
+
+class StagedCharacter(models.Model):
+    name = models.CharField(max_length=255)
+    swapi_url = models.URLField(unique=True)
+    data = models.JSONField()
+    content_hash = models.CharField(max_length=64)
+
+
+class StagedCharacterFilm(models.Model):
+    """Staged row of the Character.films through table, by SWAPI URL."""
+
+    character_url = models.URLField(db_index=True)
+    film_url = models.URLField()
+
+
+class StagedCharacterStarship(models.Model):
+    """Staged row of the Character.starships through table, by SWAPI URL."""
+
+    character_url = models.URLField(db_index=True)
+    starship_url = models.URLField()
+
+
+class SyncRun(models.Model):
+    """One run of the background SWAPI sync worker, with its outcome and duration."""
+
+    RUNNING, SUCCEEDED, FAILED = "running", "succeeded", "failed"
+    STATUS_CHOICES = [(RUNNING, "Running"), (SUCCEEDED, "Succeeded"), (FAILED, "Failed")]
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=RUNNING)
+    duration = models.FloatField(null=True, blank=True)  # seconds
+    host = models.CharField(max_length=255, blank=True, default="")
+    results = models.JSONField(default=list)  # SyncResult counts per resource
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self) -> str:
+        return f"{self.started_at:%Y-%m-%d %H:%M:%S} {self.status}"
+
+
+class SyncLease(models.Model):
+    """Named lease used to let only one process sync at a time on databases without advisory locks."""
+
+    name = models.CharField(max_length=64, unique=True)
+    holder = models.CharField(max_length=255, blank=True, default="")
+    expires_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.name} held by {self.holder or 'nobody'} until {self.expires_at}"
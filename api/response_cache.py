@@ -0,0 +1,116 @@
+"""
+Cache of the film, starship and character list responses.
+
+Responses are cached through the Django cache framework under the resource, the list query parameters (page,
+search, pagination mode and cursor) and a dataset generation number. The generation is bumped when a SWAPI sync
+commits, when a vote is committed or deleted, and when a film, starship or character is saved or deleted
+through the ORM, so a cached page is never served after the data behind it changed. Both the generation and the
+per-resource hit and miss counters live in the cache, so they only cover the whole fleet with a shared backend;
+without one API_RESPONSE_CACHE_TIMEOUT defaults to 0 and responses are not cached.
+"""
+
+import hashlib
+import json
+from functools import wraps
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.cache_generations import bump_generation, get_generation
+from api.models import Character, Film, Starship, Vote
+from api.signals import swapi_sync_finished
+
+GENERATION_KEY = "responses:generation"
+CACHED_PARAMS = ("page", "search", "pagination", "cursor")
+STATS_KEY = "responses:stats:{resource}:{outcome}"
+
+
+@receiver(swapi_sync_finished)
+@receiver([post_save, post_delete], sender=Film)
+@receiver([post_save, post_delete], sender=Starship)
+@receiver([post_save, post_delete], sender=Character)
+def invalidate_responses(**kwargs: Any) -> None:
+    bump_generation(GENERATION_KEY)
+
+
+@receiver([post_save, post_delete], sender=Vote)
+def invalidate_responses_on_vote(**kwargs: Any) -> None:
+    # Only once the vote is committed, so no reader can cache a page of the old counts after the bump
+    transaction.on_commit(lambda: bump_generation(GENERATION_KEY), robust=True)
+
+
+def response_cache_key(resource: str, request: Request) -> str:
+    params = {name: request.query_params[name] for name in CACHED_PARAMS if name in request.query_params}
+    params_key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:32]
+    return f"responses:{get_generation(GENERATION_KEY)}:{resource}:{params_key}"
+
+
+def _count(resource: str, outcome: str) -> None:
+    key = STATS_KEY.format(resource=resource, outcome=outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def response_cache_stats(resources: tuple = ("films", "starships", "characters")) -> Dict[str, Dict[str, Any]]:
+    """Hits, misses and hit rate of the response cache per resource."""
+    stats = {}
+    for resource in resources:
+        hits = cache.get(STATS_KEY.format(resource=resource, outcome="hits"), 0)
+        misses = cache.get(STATS_KEY.format(resource=resource, outcome="misses"), 0)
+        total = hits + misses
+        stats[resource] = {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 4) if total else 0.0}
+    return stats
+
+
+def reset_response_cache_stats(resources: tuple = ("films", "starships", "characters")) -> None:
+    cache.delete_many(
+        [
+            STATS_KEY.format(resource=resource, outcome=outcome)
+            for resource in resources
+            for outcome in ("hits", "misses")
+        ]
+    )
+
+
+def cached_response(resource: str) -> Callable:
+    """
+    Decorator for a list view's `get`: serve the cached response data for the same resource, query parameters
+    and dataset generation, or run the view and cache its 200 response for API_RESPONSE_CACHE_TIMEOUT seconds
+    (0 disables the cache). Responses carry an `X-Cache: HIT` or `MISS` header.
+    """
+
+    def decorator(get: Callable[..., Response]) -> Callable[..., Response]:
+        @wraps(get)
+        def wrapper(view: Any, request: Request, *args: Any, **kwargs: Any) -> Response:
+            timeout = getattr(settings, "API_RESPONSE_CACHE_TIMEOUT", 0)
+            if not timeout:
+                return get(view, request, *args, **kwargs)
+
+            key = response_cache_key(resource, request)
+            data = cache.get(key)
+            if data is not None:
+                _count(resource, "hits")
+                return Response(data, headers={"X-Cache": "HIT"})
+
+            _count(resource, "misses")
+            response = get(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                # Plain JSON types, so every backend (local memory, files, Redis) can store it
+                cache.set(key, json.loads(json.dumps(response.data, cls=JSONEncoder)), timeout=timeout)
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
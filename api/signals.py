@@ -0,0 +1,8 @@
+"""
+Signals sent by the SWAPI sync.
+"""
+
+from django.dispatch import Signal
+
+# Sent (sender=SWAPIService) once a sync transaction that wrote films, starships or characters has committed
+swapi_sync_finished = Signal()
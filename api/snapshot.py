@@ -0,0 +1,71 @@
+"""
+Offline snapshots of raw SWAPI payloads.
+
+A snapshot is a gzip-compressed JSON Lines file. The first line is a header carrying the format name, version,
+creation time, source URL and the number of items per resource; every following line holds one upstream item as
+`{"resource": ..., "data": ...}`. Loading a snapshot goes through the regular `SWAPIService` write path.
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+SNAPSHOT_FORMAT = "swapi-snapshot"
+SNAPSHOT_VERSION = 1
+# Written and read in this order, so films and starships exist before the characters linking to them
+SNAPSHOT_RESOURCES = ("films", "starships", "people")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is not a readable SWAPI snapshot."""
+
+
+def write_snapshot(path: str, resources_data: Dict[str, List[dict]], source: Optional[str] = None) -> Dict[str, int]:
+    """Write the raw payloads of every resource to `path`. Returns the number of items written per resource."""
+    counts = {resource: len(resources_data.get(resource, [])) for resource in SNAPSHOT_RESOURCES}
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "counts": counts,
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+        for resource in SNAPSHOT_RESOURCES:
+            for item in resources_data.get(resource, []):
+                f.write(json.dumps({"resource": resource, "data": item}) + "\n")
+    return counts
+
+
+def read_snapshot(path: str) -> Dict[str, List[dict]]:
+    """Read a snapshot written by `write_snapshot`, returning the raw payloads keyed by resource."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = _read_header(f.readline())
+            resources_data: Dict[str, List[dict]] = {resource: [] for resource in SNAPSHOT_RESOURCES}
+            for line_number, line in enumerate(f, start=2):
+                record = json.loads(line)
+                if record.get("resource") not in resources_data:
+                    raise SnapshotError(f"Unknown resource {record.get('resource')!r} on line {line_number}")
+                resources_data[record["resource"]].append(record["data"])
+    except SnapshotError:
+        raise
+    except (OSError, EOFError, ValueError, KeyError) as exc:
+        raise SnapshotError(f"Cannot read snapshot {path}: {exc}") from exc
+
+    counts = {resource: len(items) for resource, items in resources_data.items()}
+    if counts != header.get("counts"):
+        # A truncated file still decompresses line by line, so compare against the counts in the header
+        raise SnapshotError(f"Snapshot {path} is incomplete: expected {header.get('counts')}, found {counts}")
+    return resources_data
+
+
+def _read_header(line: str) -> dict:
+    header = json.loads(line) if line else {}
+    if header.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError("Not a SWAPI snapshot")
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {header.get('version')} (expected {SNAPSHOT_VERSION})")
+    return header
@@ -0,0 +1,129 @@
+"""
+Staged SWAPI syncs: load a refresh into the Staged* shadow tables, validate it there, then merge it into the live
+tables with set-based statements.
+
+The merge is an `INSERT ... SELECT ... ON CONFLICT (swapi_url) DO UPDATE` per table rather than a table rename
+swap, so live primary keys, and with them the Vote foreign keys, are preserved. Rows whose content hash did not
+change are not touched, which keeps the row locks taken by the publish transaction to the rows that changed.
+"""
+
+from typing import Dict, Iterable, List, Tuple, Type
+
+from django.db import connection
+from django.db.models import Exists, Model, OuterRef
+
+from api.models import (
+    Character,
+    Film,
+    StagedCharacter,
+    StagedCharacterFilm,
+    StagedCharacterStarship,
+    StagedFilm,
+    StagedStarship,
+    Starship,
+)
+
+STAGED_MODELS: Dict[Type[Model], Type[Model]] = {
+    Film: StagedFilm,
+    Starship: StagedStarship,
+    Character: StagedCharacter,
+}
+# Character relation -> (staged through model, staged target URL column, target model)
+STAGED_LINKS: Dict[str, Tuple[Type[Model], str, Type[Model]]] = {
+    "films": (StagedCharacterFilm, "film_url", Film),
+    "starships": (StagedCharacterStarship, "starship_url", Starship),
+}
+
+
+class StagingValidationError(Exception):
+    """Raised when staged data would break referential integrity; nothing has been published."""
+
+
+def clear_staging() -> None:
+    for model in (*STAGED_MODELS.values(), *(staged for staged, _, _ in STAGED_LINKS.values())):
+        model.objects.all().delete()
+
+
+def stage_rows(model: Type[Model], rows: Iterable[dict]) -> None:
+    """Insert rows (field -> value, including swapi_url, data and content_hash) into the shadow table of `model`."""
+    staged_model = STAGED_MODELS[model]
+    staged_model.objects.bulk_create([staged_model(**row) for row in rows])
+
+
+def stage_links(relation: str, links: Iterable[Tuple[str, str]]) -> None:
+    """Insert (character URL, target URL) pairs into the shadow through table of `relation`."""
+    staged_model, target_column, _ = STAGED_LINKS[relation]
+    staged_model.objects.bulk_create(
+        [staged_model(character_url=character_url, **{target_column: url}) for character_url, url in set(links)]
+    )
+
+
+def validate_staging() -> None:
+    """Every staged link must point at a film or starship that is staged or already live."""
+    for relation, (staged_model, target_column, target_model) in STAGED_LINKS.items():
+        dangling = (
+            staged_model.objects.exclude(
+                **{f"{target_column}__in": STAGED_MODELS[target_model].objects.values("swapi_url")}
+            )
+            .exclude(**{f"{target_column}__in": target_model.objects.values("swapi_url")})
+            .values_list(target_column, flat=True)
+            .distinct()
+        )
+        missing = list(dangling[:5])
+        if missing:
+            raise StagingValidationError(f"Staged characters link to unknown {relation}: {', '.join(missing)}")
+
+
+def merge_staged_rows(model: Type[Model], columns: List[str]) -> Tuple[int, int, int]:
+    """
+    Merge the shadow table of `model` into the live table and return (created, updated, unchanged) counts.
+    `columns` are the model fields written besides swapi_url, data and content_hash.
+    """
+    staged_model = STAGED_MODELS[model]
+    live_rows = model.objects.filter(swapi_url=OuterRef("swapi_url"))
+    total = staged_model.objects.count()
+    created = staged_model.objects.exclude(Exists(live_rows)).count()
+    updated = staged_model.objects.filter(Exists(live_rows.exclude(content_hash=OuterRef("content_hash")))).count()
+
+    qn = connection.ops.quote_name
+    table, staged_table = qn(model._meta.db_table), qn(staged_model._meta.db_table)
+    column_list = ", ".join(qn(column) for column in ["swapi_url", *columns, "data", "content_hash"])
+    assignments = ", ".join(f"{qn(column)} = excluded.{qn(column)}" for column in [*columns, "data", "content_hash"])
+    with connection.cursor() as cursor:
+        # `WHERE true` keeps SQLite from parsing ON CONFLICT as part of the SELECT's join clause
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staged_table} WHERE true "
+            f"ON CONFLICT (swapi_url) DO UPDATE SET {assignments} "
+            f"WHERE {table}.content_hash <> excluded.content_hash"
+        )
+    return created, updated, total - created - updated
+
+
+def merge_staged_links() -> None:
+    """
+    Make the live through tables match the staged links of every staged character: links that are no longer
+    staged are deleted and new ones inserted, joined on SWAPI URLs. Links of characters that were not staged
+    are left alone.
+    """
+    qn = connection.ops.quote_name
+    for relation, (staged_model, target_column, target_model) in STAGED_LINKS.items():
+        through = getattr(Character, relation).through
+        target_id_column = through._meta.get_field(target_model._meta.model_name).column
+
+        staged_link = staged_model.objects.filter(
+            character_url=OuterRef("character__swapi_url"),
+            **{target_column: OuterRef(f"{target_model._meta.model_name}__swapi_url")},
+        )
+        through.objects.filter(character__swapi_url__in=StagedCharacter.objects.values("swapi_url")).exclude(
+            Exists(staged_link)
+        ).delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(through._meta.db_table)} (character_id, {qn(target_id_column)}) "
+                f"SELECT DISTINCT c.id, t.id FROM {qn(staged_model._meta.db_table)} l "
+                f"JOIN {qn(Character._meta.db_table)} c ON c.swapi_url = l.character_url "
+                f"JOIN {qn(target_model._meta.db_table)} t ON t.swapi_url = l.{qn(target_column)} "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {qn(through._meta.db_table)} x "
+                f"WHERE x.character_id = c.id AND x.{qn(target_id_column)} = t.id)"
+            )
@@ -1,180 +1,665 @@
+import asyncio
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, List
-
-from django.db import transaction
-
-from api.models import Character, Film, Starship
+from functools import wraps
+from itertools import dropwhile, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Model
+
+from api.models import Character, Film, Starship, SyncCheckpoint
+from api.signals import swapi_sync_finished
+from api.snapshot import read_snapshot, write_snapshot
+from api.staging import (
+    STAGED_LINKS,
+    clear_staging,
+    merge_staged_links,
+    merge_staged_rows,
+    stage_links,
+    stage_rows,
+    validate_staging,
+)
+from api.sync_metrics import SyncMetrics
+from clients.async_swapi_client import AsyncSWAPIClient
 from clients.swapi_client import SWAPIClient
+from clients.utils.cache import HTTPCache
+from clients.utils.exceptions import SWAPIClientError
+from clients.utils.retry import RetryPolicy, backoff_delay, is_transient_error
+from clients.utils.throttling import CircuitBreaker, TokenBucket
+
+T = TypeVar("T")
+
+
+def compute_content_hash(payload: dict) -> str:
+    """Stable SHA-256 of a SWAPI payload, used to skip rows whose upstream data has not changed."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+@dataclass
+class SyncResult:
+    """Row counts for one synced SWAPI resource."""
+
+    resource: str
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.resource}: {self.created} created, {self.updated} updated, {self.unchanged} unchanged"
+
+
+@dataclass
+class SyncReport:
+    """Results of an orchestrated sync, with the wall-clock seconds spent in each phase."""
+
+    results: List[SyncResult]
+    timings: Dict[str, float]
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split `items` into lists of at most `size` elements."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@dataclass(frozen=True)
+class ResourceSpec:
+    """How SWAPI payloads of one resource map onto a model, for the generic upsert engine."""
+
+    resource: str  # SWAPI resource path, e.g. "people"
+    label: str
+    model: Type[Model]
+    # Model fields derived from the payload, besides swapi_url, data and content_hash
+    update_fields: Tuple[str, ...]
+    fields: Callable[[dict], Dict[str, Any]]
+
+
+FILM_SPEC = ResourceSpec(
+    resource="films",
+    label="Films",
+    model=Film,
+    update_fields=("title", "release_date"),
+    # Parse the release_date from SWAPI format (YYYY-MM-DD) to date object
+    fields=lambda data: {
+        "title": data["title"],
+        "release_date": datetime.strptime(data["release_date"], "%Y-%m-%d").date(),
+    },
+)
+STARSHIP_SPEC = ResourceSpec(
+    resource="starships",
+    label="Starships",
+    model=Starship,
+    update_fields=("name",),
+    fields=lambda data: {"name": data["name"]},
+)
+CHARACTER_SPEC = ResourceSpec(
+    resource="people",
+    label="Characters",
+    model=Character,
+    update_fields=("name",),
+    fields=lambda data: {"name": data["name"]},
+)
+RESOURCE_SPECS = {spec.resource: spec for spec in (FILM_SPEC, STARSHIP_SPEC, CHARACTER_SPEC)}
+
+
+def apply_transaction(func):  # type: ignore
+    """
+    Decorator for the write-only apply phase of a sync.
+    Runs the wrapped method in its own short transaction and, on PostgreSQL, bounds how long it may wait
+    for row locks (SWAPI_SYNC_LOCK_TIMEOUT_MS) so a sync gives up instead of queueing behind live traffic.
+    Sends `swapi_sync_finished` once the transaction commits.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with transaction.atomic():
+            lock_timeout_ms = getattr(settings, "SWAPI_SYNC_LOCK_TIMEOUT_MS", 0)
+            if lock_timeout_ms and connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL lock_timeout = %s", [f"{lock_timeout_ms}ms"])
+            result = func(*args, **kwargs)
+            transaction.on_commit(lambda: swapi_sync_finished.send(sender=type(args[0])), robust=True)
+            return result
+
+    return wrapper
+
+
+def parse_swapi_url(url: str) -> Tuple[str, str]:
+    """Split a SWAPI item URL such as `https://swapi.dev/api/people/1/` into ("people", "1")."""
+    parts = urlparse(url).path.strip("/").split("/")
+    if len(parts) < 2 or parts[-2] not in RESOURCE_SPECS or not parts[-1].isdigit():
+        raise ValueError(f"Not a SWAPI film, starship or character URL: {url}")
+    return parts[-2], parts[-1]
+
+
+def _in_thread_connection(func: Callable[..., T], *args: Any) -> T:
+    """Run `func` in a worker thread and close the database connection Django opened for that thread."""
+    try:
+        return func(*args)
+    finally:
+        connection.close()
+
+
+def build_swapi_client(max_workers: Optional[int] = None) -> SWAPIClient:
+    """
+    SWAPIClient configured from the SWAPI_* settings: concurrency, connection pool, retries, rate limit,
+    circuit breaker and HTTP cache. `max_workers` overrides SWAPI_FETCH_WORKERS.
+    """
+    if max_workers is None:
+        max_workers = int(getattr(settings, "SWAPI_FETCH_WORKERS", 1))
+    rate_limit = float(getattr(settings, "SWAPI_RATE_LIMIT", 0))
+    rate_burst = float(getattr(settings, "SWAPI_RATE_BURST", 0)) or None  # None: burst of one second's rate
+    cache_dir = getattr(settings, "SWAPI_HTTP_CACHE_DIR", "")
+    breaker_threshold = int(getattr(settings, "SWAPI_CIRCUIT_BREAKER_THRESHOLD", 0))
+    return SWAPIClient(
+        disable_ssl_verification=True,
+        max_workers=max_workers,
+        pool_maxsize=int(getattr(settings, "SWAPI_POOL_MAXSIZE", 10)),
+        retry_policy=RetryPolicy(
+            max_retries=int(getattr(settings, "SWAPI_MAX_RETRIES", 0)),
+            base_delay=float(getattr(settings, "SWAPI_RETRY_BACKOFF", 1.0)),
+        ),
+        rate_limiter=TokenBucket(rate_limit, rate_burst) if rate_limit > 0 else None,
+        circuit_breaker=(
+            CircuitBreaker(breaker_threshold, getattr(settings, "SWAPI_CIRCUIT_BREAKER_RESET", 30.0))
+            if breaker_threshold
+            else None
+        ),
+        cache=(
+            HTTPCache(
+                cache_dir,
+                max_bytes=getattr(settings, "SWAPI_HTTP_CACHE_MAX_BYTES", None),
+                max_age=getattr(settings, "SWAPI_HTTP_CACHE_MAX_AGE", None),
+            )
+            if cache_dir
+            else None
+        ),
+    )
 
 
 class SWAPIService:
     def __init__(self) -> None:
-        self.client = SWAPIClient(disable_ssl_verification=True)
-        self.films_cache: Dict[str, Film] = {}
-        self.starships_cache: Dict[str, Starship] = {}
+        self.client = build_swapi_client()
+        # Number of rows written per upsert statement
+        self.batch_size = getattr(settings, "SWAPI_SYNC_BATCH_SIZE", 500)
+        # Retries and base backoff (seconds) for a page that fails transiently during a streaming sync
+        self.page_retries = getattr(settings, "SWAPI_PAGE_RETRIES", 3)
+        self.retry_backoff = getattr(settings, "SWAPI_RETRY_BACKOFF", 1.0)
+        # Per-phase timing, row and query counts of everything this service syncs
+        self.metrics = SyncMetrics()
+        # swapi_url -> pk of films and starships, for linking characters without loading model instances
+        self.films_cache: Dict[str, int] = {}
+        self.starships_cache: Dict[str, int] = {}
+        # Set when films or starships are created, since characters may now link to rows that were missing before
+        self.new_relation_targets = False
 
     def _build_films_cache(self) -> None:
-        """Build cache mapping SWAPI URLs to Film objects"""
-        films = Film.objects.all()
-        self.films_cache = {film.swapi_url: film for film in films}
+        """Build cache mapping SWAPI URLs to Film primary keys"""
+        with self.metrics.phase("cache_build") as sample:
+            self.films_cache = dict(Film.objects.values_list("swapi_url", "id"))
+            sample.rows = len(self.films_cache)
 
     def _build_starships_cache(self) -> None:
-        """Build cache mapping SWAPI URLs to Starship objects"""
-        starships = Starship.objects.all()
-        self.starships_cache = {starship.swapi_url: starship for starship in starships}
-
-    @transaction.atomic
-    def fetch_and_store_films(self) -> List[Film]:
-        films_data = self.client.fetch_films()
-
-        # Prefetch all existing films into a dictionary keyed by swapi_url
-        incoming_urls = [film_data["url"] for film_data in films_data]
-        existing_films_dict: Dict[str, Film] = {
-            film.swapi_url: film for film in Film.objects.filter(swapi_url__in=incoming_urls)
-        }
-
-        films_to_create = []
-        films_to_update = []
-
-        for film_data in films_data:
-            # Parse the release_date from SWAPI format (YYYY-MM-DD) to date object
-            release_date = datetime.strptime(film_data["release_date"], "%Y-%m-%d").date()
-
-            if film_data["url"] in existing_films_dict:
-                # Update existing film (no database query needed)
-                film = existing_films_dict[film_data["url"]]
-                film.title = film_data["title"]
-                film.release_date = release_date
-                film.data = film_data
-                films_to_update.append(film)
-            else:
-                # Create new film
-                films_to_create.append(
-                    Film(
-                        title=film_data["title"],
-                        swapi_url=film_data["url"],
-                        release_date=release_date,
-                        data=film_data,
+        """Build cache mapping SWAPI URLs to Starship primary keys"""
+        with self.metrics.phase("cache_build") as sample:
+            self.starships_cache = dict(Starship.objects.values_list("swapi_url", "id"))
+            sample.rows = len(self.starships_cache)
+
+    def _update_relation_cache(self, spec: ResourceSpec, ids: Dict[str, int]) -> None:
+        """
+        Fold the swapi_url -> pk mappings of rows just upserted into the films or starships cache. The table is
+        only read the first time, after that the cache is kept current from the upserts themselves.
+        """
+        if spec is FILM_SPEC:
+            if not self.films_cache:
+                self._build_films_cache()
+            cache = self.films_cache
+        elif spec is STARSHIP_SPEC:
+            if not self.starships_cache:
+                self._build_starships_cache()
+            cache = self.starships_cache
+        else:
+            return
+        with self.metrics.phase("cache_update") as sample:
+            cache.update(ids)
+            sample.rows = len(ids)
+
+    def _sync_character_relations(self, character_ids: Dict[str, int], characters_data_dict: Dict[str, dict]) -> None:
+        """
+        Diff the desired film and starship links of the characters in `character_ids` (swapi_url -> pk) against
+        the through-table rows in memory, then apply it with one bulk insert and one bulk delete per relation,
+        whatever the roster size.
+        """
+        if not character_ids:
+            return
+
+        with self.metrics.phase("m2m_sync") as sample:
+            sample.rows = self._diff_character_relations(character_ids, characters_data_dict)
+
+    def _diff_character_relations(self, character_ids: Dict[str, int], characters_data_dict: Dict[str, dict]) -> int:
+        """Apply the through-table diff for `_sync_character_relations`. Returns the number of links changed."""
+        changed = 0
+        relations = (("films", "film_id", self.films_cache), ("starships", "starship_id", self.starships_cache))
+        for relation, target_field, cache in relations:
+            through = getattr(Character, relation).through
+
+            desired_links = {
+                (character_id, cache[url])
+                for character_url, character_id in character_ids.items()
+                for url in characters_data_dict[character_url][relation]
+                if url in cache
+            }
+            existing_links = {
+                (character_id, target_id): row_id
+                for row_id, character_id, target_id in through.objects.filter(
+                    character_id__in=character_ids.values()
+                ).values_list("id", "character_id", target_field)
+            }
+
+            stale_row_ids = [row_id for link, row_id in existing_links.items() if link not in desired_links]
+            if stale_row_ids:
+                through.objects.filter(id__in=stale_row_ids).delete()
+
+            new_links = desired_links - existing_links.keys()
+            if new_links:
+                through.objects.bulk_create(
+                    [
+                        through(character_id=character_id, **{target_field: target_id})
+                        for character_id, target_id in new_links
+                    ]
+                )
+            changed += len(stale_row_ids) + len(new_links)
+        return changed
+
+    def _upsert(
+        self, spec: ResourceSpec, payloads: Iterable[dict], result: SyncResult, force: bool = False
+    ) -> Dict[str, int]:
+        """
+        Write `payloads` for `spec.model` in batches of `self.batch_size`.
+        Returns swapi_url -> pk for every payload, written or unchanged.
+        """
+        ids: Dict[str, int] = {}
+        for batch in batched(payloads, self.batch_size):
+            written, unchanged = self._upsert_batch(spec, batch, result, force=force)
+            ids.update(written)
+            ids.update(unchanged)
+        return ids
+
+    def _upsert_batch(
+        self, spec: ResourceSpec, batch: List[dict], result: SyncResult, force: bool = False
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Read the stored content hashes of the batch URLs, skip unchanged payloads and write the rest with one
+        `bulk_create(update_conflicts=True)` statement keyed on `swapi_url`, so new and changed rows go to the
+        database together. `force` rewrites unchanged rows too. Returns (written, unchanged) mappings of
+        swapi_url -> pk.
+        """
+        with self.metrics.phase("prefetch") as sample:
+            existing = {
+                swapi_url: (pk, content_hash)
+                for swapi_url, pk, content_hash in spec.model.objects.filter(
+                    swapi_url__in=[payload["url"] for payload in batch]
+                ).values_list("swapi_url", "id", "content_hash")
+            }
+            sample.rows = len(existing)
+
+        rows = []
+        unchanged: Dict[str, int] = {}
+        with self.metrics.phase("parse") as sample:
+            for payload in batch:
+                content_hash = compute_content_hash(payload)
+                pk, stored_hash = existing.get(payload["url"], (None, None))
+                if stored_hash == content_hash and not force:
+                    # Upstream payload is unchanged, nothing to write
+                    unchanged[payload["url"]] = pk
+                    continue
+                rows.append(
+                    spec.model(
+                        swapi_url=payload["url"], data=payload, content_hash=content_hash, **spec.fields(payload)
                     )
                 )
+            sample.rows = len(batch)
+
+        with self.metrics.phase("upsert") as sample:
+            if rows:
+                spec.model.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["swapi_url"],
+                    update_fields=[*spec.update_fields, "data", "content_hash"],
+                )
 
-        # Perform bulk operations
-        created_films = Film.objects.bulk_create(films_to_create) if films_to_create else []
-
-        if films_to_update:
-            Film.objects.bulk_update(films_to_update, fields=["title", "release_date", "data"])
-
-        # Build films cache right after creating/updating films
-        self._build_films_cache()
-
-        return created_films + films_to_update
-
-    @transaction.atomic
-    def fetch_and_store_starships(self) -> List[Starship]:
-        starships_data = self.client.fetch_starships()
-
-        # Prefetch all existing starships into a dictionary keyed by swapi_url
-        incoming_urls = [starship_data["url"] for starship_data in starships_data]
-        existing_starships_dict: Dict[str, Starship] = {
-            starship.swapi_url: starship for starship in Starship.objects.filter(swapi_url__in=incoming_urls)
+            written = {row.swapi_url: row.pk for row in rows}
+            missing_pks = [swapi_url for swapi_url, pk in written.items() if pk is None]
+            if missing_pks:
+                # Backends that cannot return rows from a bulk upsert leave the primary keys unset
+                written.update(spec.model.objects.filter(swapi_url__in=missing_pks).values_list("swapi_url", "id"))
+            sample.rows = len(rows)
+        result.created += sum(1 for row in rows if row.swapi_url not in existing)
+        result.updated += sum(1 for row in rows if row.swapi_url in existing)
+        result.unchanged += len(unchanged)
+        return written, unchanged
+
+    async def afetch_resources(self) -> Dict[str, List[Any]]:
+        """
+        Download films, starships and people concurrently, returning the raw payloads keyed by resource. The
+        threaded client's retry policy, rate limiter and circuit breaker are shared with the asyncio client.
+        """
+        async with AsyncSWAPIClient(
+            disable_ssl_verification=True,
+            max_concurrency=self.client.max_workers,
+            retry_policy=self.client.retry_policy,
+            rate_limiter=self.client.rate_limiter,
+            circuit_breaker=self.client.circuit_breaker,
+        ) as client:
+            return await client.fetch_everything()
+
+    def metrics_report(self, results: Iterable[SyncResult]) -> Dict[str, Any]:
+        """JSON-serializable report of a sync: row counts per resource, per-phase metrics and HTTP transport stats."""
+        return {
+            "results": [asdict(result) for result in results],
+            **self.metrics.as_dict(),
+            "http": self.client.stats.snapshot(),
         }
 
-        starships_to_create = []
-        starships_to_update = []
-
-        for starship_data in starships_data:
-            if starship_data["url"] in existing_starships_dict:
-                # Update existing starship (no database query needed - using dict lookup)
-                starship = existing_starships_dict[starship_data["url"]]
-                starship.name = starship_data["name"]
-                starship.data = starship_data
-                starships_to_update.append(starship)
-            else:
-                # Create new starship
-                starships_to_create.append(
-                    Starship(
-                        name=starship_data["name"],
-                        swapi_url=starship_data["url"],
-                        data=starship_data,
+    def _fetch(self, resource: str) -> List[Any]:
+        """Download every page of `resource` with the threaded client."""
+        with self.metrics.phase("fetch") as sample:
+            items = getattr(self.client, f"fetch_{resource}")()
+            sample.rows = len(items)
+        return items
+
+    def fetch_resources(self, use_async: bool = False) -> Dict[str, List[Any]]:
+        """Download films, starships and people, returning the raw payloads keyed by resource."""
+        if use_async:
+            with self.metrics.phase("fetch") as sample:
+                resources_data = asyncio.run(self.afetch_resources())
+                sample.rows = sum(len(items) for items in resources_data.values())
+            return resources_data
+        return {resource: self._fetch(resource) for resource in ("films", "starships", "people")}
+
+    def store_resources(self, resources_data: Dict[str, List[Any]]) -> List[SyncResult]:
+        """Write already downloaded payloads (keyed by resource) in dependency order."""
+        return [
+            self.store_films(resources_data["films"]),
+            self.store_starships(resources_data["starships"]),
+            self.store_characters(resources_data["people"]),
+        ]
+
+    def fetch_and_store_all_async(self) -> List[SyncResult]:
+        """Overlap the network I/O of all resources, then run the DB writes in dependency order."""
+        return self.store_resources(self.fetch_resources(use_async=True))
+
+    def sync_orchestrated(self, use_async: bool = False, concurrent_apply: Optional[bool] = None) -> SyncReport:
+        """
+        Download films, starships and people in parallel, then apply films and starships concurrently and
+        finally characters, whose relations need the films and starships caches built by the first apply phase.
+
+        Concurrent applies use one database connection per thread. They are only worth it on PostgreSQL; SQLite
+        serializes writers, so by default both resources are applied one after the other there.
+        """
+        if concurrent_apply is None:
+            concurrent_apply = connection.vendor == "postgresql"
+        timings: Dict[str, float] = {}
+
+        started_at = time.perf_counter()
+        if use_async:
+            resources_data = self.fetch_resources(use_async=True)
+        else:
+            resources = ("films", "starships", "people")
+            # Every resource fetches its pages with up to max_workers threads, all sharing one session
+            self.client.ensure_pool_size(len(resources) * self.client.max_workers)
+            with ThreadPoolExecutor(max_workers=len(resources)) as executor:
+                futures = {resource: executor.submit(self._fetch, resource) for resource in resources}
+                resources_data = {resource: future.result() for resource, future in futures.items()}
+        timings["fetch"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        if concurrent_apply:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                films = executor.submit(_in_thread_connection, self.store_films, resources_data["films"])
+                starships = executor.submit(_in_thread_connection, self.store_starships, resources_data["starships"])
+                results = [films.result(), starships.result()]
+        else:
+            results = [self.store_films(resources_data["films"]), self.store_starships(resources_data["starships"])]
+        timings["apply films and starships"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        results.append(self.store_characters(resources_data["people"]))
+        timings["apply characters"] = time.perf_counter() - started_at
+        return SyncReport(results, timings)
+
+    def export_snapshot(self, path: str, use_async: bool = False) -> List[SyncResult]:
+        """Download every resource, write the raw payloads to a snapshot at `path`, then store them."""
+        resources_data = self.fetch_resources(use_async=use_async)
+        write_snapshot(path, resources_data, source=self.client.BASE_URL)
+        return self.store_resources(resources_data)
+
+    def load_snapshot(self, path: str) -> List[SyncResult]:
+        """Store the payloads of a snapshot written by `export_snapshot`, without any network access."""
+        return self.store_resources(read_snapshot(path))
+
+    def resync_urls(self, urls: Iterable[str]) -> List[SyncResult]:
+        """
+        Refresh individual items by `swapi_url`: fetch their detail endpoints concurrently, then rewrite just those
+        rows (and, for characters, their film and starship links) even if their content hash is unchanged.
+        Raises ValueError for URLs that are not SWAPI film, starship or character URLs.
+        """
+        items = list(dict.fromkeys(parse_swapi_url(url) for url in urls))
+        payloads = self.client.fetch_items(items)
+        resources_data: Dict[str, List[dict]] = {resource: [] for resource in RESOURCE_SPECS}
+        for (resource, _), payload in zip(items, payloads):
+            resources_data[resource].append(payload)
+
+        results = []
+        if resources_data["films"]:
+            results.append(self.store_films(resources_data["films"], force=True))
+        if resources_data["starships"]:
+            results.append(self.store_starships(resources_data["starships"], force=True))
+        if resources_data["people"]:
+            results.append(self.store_characters(resources_data["people"], force=True))
+        return results
+
+    def stage_and_publish(self, resources_data: Dict[str, List[Any]]) -> List[SyncResult]:
+        """
+        Staged sync for very large refreshes: load films, starships, characters and their links into the shadow
+        tables, check referential integrity there, then publish everything in one short transaction. Readers of the
+        live tables see either the previous dataset or the new one, never a half-applied sync.
+        Raises StagingValidationError, leaving the live tables untouched, if the staged data is inconsistent.
+        """
+        self.stage_resources(resources_data)
+        with self.metrics.phase("validate"):
+            validate_staging()
+        try:
+            results = self.publish_staging()
+        finally:
+            with transaction.atomic():
+                clear_staging()
+        # Published rows may have new primary keys; reload the caches on next use
+        self.films_cache, self.starships_cache = {}, {}
+        return results
+
+    def stage_resources(self, resources_data: Dict[str, List[Any]]) -> None:
+        """Replace the contents of the shadow tables with `resources_data`, batch by batch."""
+        with self.metrics.phase("stage") as sample, transaction.atomic():
+            clear_staging()
+            for spec in (FILM_SPEC, STARSHIP_SPEC, CHARACTER_SPEC):
+                for batch in batched(resources_data[spec.resource], self.batch_size):
+                    stage_rows(
+                        spec.model,
+                        (
+                            dict(swapi_url=payload["url"], data=payload, content_hash=compute_content_hash(payload))
+                            | spec.fields(payload)
+                            for payload in batch
+                        ),
                     )
+                    sample.rows += len(batch)
+            for relation in STAGED_LINKS:
+                for batch in batched(resources_data["people"], self.batch_size):
+                    stage_links(relation, ((payload["url"], url) for payload in batch for url in payload[relation]))
+
+    @apply_transaction
+    def publish_staging(self) -> List[SyncResult]:
+        """Merge the shadow tables into the live ones with set-based statements, in dependency order."""
+        results = []
+        with self.metrics.phase("publish") as sample:
+            for spec in (FILM_SPEC, STARSHIP_SPEC, CHARACTER_SPEC):
+                result = SyncResult(spec.label)
+                result.created, result.updated, result.unchanged = merge_staged_rows(
+                    spec.model, list(spec.update_fields)
                 )
-
-        # Perform bulk operations
-        created_starships = Starship.objects.bulk_create(starships_to_create) if starships_to_create else []
-
-        if starships_to_update:
-            Starship.objects.bulk_update(starships_to_update, fields=["name", "data"])
-
-        # Build starships cache right after creating/updating starships
-        self._build_starships_cache()
-
-        return created_starships + starships_to_update
-
-    @transaction.atomic
-    def fetch_and_store_characters(self) -> List[Character]:
-        # Ensure caches are built before accessing them if they are empty
+                results.append(result)
+            merge_staged_links()
+            sample.rows = sum(result.created + result.updated for result in results)
+        return results
+
+    def fetch_and_store_films(self) -> SyncResult:
+        # The download happens before the apply transaction opens, so no locks are held during network I/O
+        return self.store_films(self._fetch("films"))
+
+    @apply_transaction
+    def store_films(self, films_data: List[dict], force: bool = False) -> SyncResult:
+        result = SyncResult(FILM_SPEC.label)
+        ids = self._upsert(FILM_SPEC, films_data, result, force=force)
+        if result.created:
+            self.new_relation_targets = True
+
+        # Update films cache right after creating/updating films
+        self._update_relation_cache(FILM_SPEC, ids)
+        return result
+
+    def fetch_and_store_starships(self) -> SyncResult:
+        return self.store_starships(self._fetch("starships"))
+
+    @apply_transaction
+    def store_starships(self, starships_data: List[dict], force: bool = False) -> SyncResult:
+        result = SyncResult(STARSHIP_SPEC.label)
+        ids = self._upsert(STARSHIP_SPEC, starships_data, result, force=force)
+        if result.created:
+            self.new_relation_targets = True
+
+        # Update starships cache right after creating/updating starships
+        self._update_relation_cache(STARSHIP_SPEC, ids)
+        return result
+
+    def fetch_and_store_characters(self) -> SyncResult:
+        return self.store_characters(self._fetch("people"))
+
+    @apply_transaction
+    def store_characters(self, characters_data: List[dict], force: bool = False) -> SyncResult:
+        result = SyncResult(CHARACTER_SPEC.label)
+        self._ensure_relation_caches()
+        for batch in batched(characters_data, self.batch_size):
+            self._store_characters_batch(batch, result, force=force)
+        return result
+
+    def _ensure_relation_caches(self) -> None:
+        """Ensure caches are built before accessing them if they are empty"""
         if not self.films_cache:
             self._build_films_cache()
         if not self.starships_cache:
             self._build_starships_cache()
 
-        characters_data = self.client.fetch_people()
-
-        # Prefetch all existing characters into a dictionary keyed by swapi_url
-        incoming_urls = [character_data["url"] for character_data in characters_data]
-        existing_characters_dict: Dict[str, Character] = {
-            character.swapi_url: character for character in Character.objects.filter(swapi_url__in=incoming_urls)
-        }
-
-        characters_to_create = []
-        characters_to_update = []
-
-        for character_data in characters_data:
-            if character_data["url"] in existing_characters_dict:
-                # Update existing character (no database query needed)
-                character = existing_characters_dict[character_data["url"]]
-                character.name = character_data["name"]
-                character.data = character_data
-                characters_to_update.append(character)
+    def _store_characters_batch(self, batch: List[dict], result: SyncResult, force: bool = False) -> None:
+        written, unchanged = self._upsert_batch(CHARACTER_SPEC, batch, result, force=force)
+
+        # Only created and updated characters need their relationships synced, unless films or starships were
+        # created in this run, in which case unchanged characters may now resolve links that were missing before
+        characters_to_link = {**written, **unchanged} if self.new_relation_targets else written
+        self._sync_character_relations(characters_to_link, {char_data["url"]: char_data for char_data in batch})
+
+    def stream_and_store(self, resource: str, resume: bool = False) -> SyncResult:
+        """
+        Stream a SWAPI resource page by page and upsert it in chunks of about `self.batch_size` rows, committing
+        each chunk in its own transaction. Peak memory is bounded by the chunk size rather than by the dataset size.
+
+        Chunks end on page boundaries and commit together with a `SyncCheckpoint` of their last page, so with
+        `resume=True` an interrupted sync carries on after the last committed page (or skips a completed
+        resource). Resources must be streamed in dependency order: films and starships before people.
+        A run without `resume` starts a new sync, so it discards the checkpoints of this resource and of every
+        resource streamed after it; a later resume then cannot skip resources this run has not synced yet.
+        Once every resource is completed there is nothing left to resume, so a resume starts a new sync too.
+        """
+        spec = RESOURCE_SPECS[resource]
+        result = SyncResult(spec.label)
+        if resume:
+            completed = SyncCheckpoint.objects.filter(resource__in=RESOURCE_SPECS, completed=True).count()
+            resume = completed < len(RESOURCE_SPECS)
+        if resume:
+            checkpoint = SyncCheckpoint.objects.filter(resource=resource).first()
+            if checkpoint and checkpoint.completed:
+                return result
+        else:
+            checkpoint = None
+            downstream = list(dropwhile(lambda name: name != resource, RESOURCE_SPECS))
+            SyncCheckpoint.objects.filter(resource__in=downstream).delete()
+        if spec is CHARACTER_SPEC:
+            self._ensure_relation_caches()
+
+        chunk: List[dict] = []
+        last_page = checkpoint.last_page if checkpoint else 0
+        for page, items in self._iter_pages_with_retries(resource, start_page=last_page + 1):
+            # A full chunk is only committed once another page is known to follow, so the chunk holding the
+            # last page is always the one that marks the resource completed
+            if len(chunk) >= self.batch_size:
+                # Caches only learn about rows once their chunk is committed
+                self._update_relation_cache(spec, self._store_chunk(spec, chunk, result, last_page))
+                chunk = []
+            chunk.extend(items)
+            last_page = page
+        self._update_relation_cache(spec, self._store_chunk(spec, chunk, result, last_page, completed=True))
+        return result
+
+    def _iter_pages_with_retries(self, resource: str, start_page: int) -> Iterator[Tuple[int, List[dict]]]:
+        """
+        Yield the pages of `resource` from `start_page`, retrying a page that fails transiently up to
+        `self.page_retries` times with exponential backoff before giving up.
+        """
+        next_page, attempt = start_page, 0
+        while True:
+            try:
+                pages = self.client.iter_pages(resource, start_page=next_page)
+                while True:
+                    # Only the wait for the next page is measured, not what the caller does with the previous one
+                    with self.metrics.phase("fetch") as sample:
+                        fetched = next(pages, None)
+                        sample.rows = len(fetched[1]) if fetched else 0
+                        sample.calls = 1 if fetched else 0
+                    if fetched is None:
+                        return
+                    yield fetched
+                    next_page, attempt = fetched[0] + 1, 0
+            except SWAPIClientError as exc:
+                attempt += 1
+                if attempt > self.page_retries or not is_transient_error(exc):
+                    raise
+                time.sleep(backoff_delay(attempt, self.retry_backoff))
+
+    @apply_transaction
+    def _store_chunk(
+        self, spec: ResourceSpec, chunk: List[dict], result: SyncResult, last_page: int, completed: bool = False
+    ) -> Dict[str, int]:
+        """Upsert one chunk and record its checkpoint. Returns swapi_url -> pk of the films or starships stored."""
+        created_before = result.created
+        ids: Dict[str, int] = {}
+        for batch in batched(chunk, self.batch_size):
+            if spec is CHARACTER_SPEC:
+                self._store_characters_batch(batch, result)
             else:
-                # Create new character
-                characters_to_create.append(
-                    Character(
-                        name=character_data["name"],
-                        swapi_url=character_data["url"],
-                        data=character_data,
-                    )
-                )
-
-        # Perform bulk operations
-        created_characters = Character.objects.bulk_create(characters_to_create) if characters_to_create else []
-
-        if characters_to_update:
-            Character.objects.bulk_update(characters_to_update, fields=["name", "data"])
-
-        # Handle many-to-many relationships for all characters (both new and updated)
-        all_characters = list(created_characters) + characters_to_update
-        characters_data_dict = {char_data["url"]: char_data for char_data in characters_data}
-
-        for character in all_characters:
-            character_data = characters_data_dict[character.swapi_url]
-
-            # Clear existing relationships for updated characters
-            character.films.clear()
-            character.starships.clear()
-
-            # Add films
-            films = [self.films_cache[film_url] for film_url in character_data["films"] if film_url in self.films_cache]
-            if films:
-                character.films.add(*films)
-
-            # Add starships
-            starships = [
-                self.starships_cache[starship_url]
-                for starship_url in character_data["starships"]
-                if starship_url in self.starships_cache
-            ]
-            if starships:
-                character.starships.add(*starships)
-
-        return all_characters
+                written, unchanged = self._upsert_batch(spec, batch, result)
+                ids.update(written)
+                ids.update(unchanged)
+        self.new_relation_targets |= spec is not CHARACTER_SPEC and result.created > created_before
+
+        SyncCheckpoint.objects.update_or_create(
+            resource=spec.resource, defaults={"last_page": last_page, "completed": completed}
+        )
+        return ids
@@ -0,0 +1,84 @@
+"""
+Timing and row metrics for SWAPI syncs.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator
+
+from django.db import connection
+
+
+@dataclass
+class PhaseMetrics:
+    """Totals for one sync phase: how often it ran, wall time, rows handled and SQL queries issued."""
+
+    calls: int = 0
+    wall_time: float = 0.0
+    rows: int = 0
+    queries: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wall_time_ms": round(1000 * self.wall_time, 2),
+            "rows": self.rows,
+            "queries": self.queries,
+        }
+
+
+class SyncMetrics:
+    """
+    Thread-safe per-phase metrics of a SWAPIService sync.
+
+    Usage:
+        with metrics.phase("prefetch") as sample:
+            existing = ...
+            sample.rows = len(existing)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Optional SyncProfiler; when set, every phase also runs under its cProfile/tracemalloc section
+        self.profiler: Any = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.phases: Dict[str, PhaseMetrics] = {}
+            self.started_at = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseMetrics]:
+        """Time the block and count the queries it runs on this thread's connection, then add them to `name`."""
+        sample = PhaseMetrics(calls=1)
+
+        def count_query(execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+            sample.queries += 1
+            return execute(sql, params, many, context)
+
+        profile = self.profiler.section(name) if self.profiler else nullcontext()
+        started_at = time.perf_counter()
+        try:
+            with profile, connection.execute_wrapper(count_query):
+                yield sample
+        finally:
+            sample.wall_time = time.perf_counter() - started_at
+            self._add(name, sample)
+
+    def _add(self, name: str, sample: PhaseMetrics) -> None:
+        with self._lock:
+            totals = self.phases.setdefault(name, PhaseMetrics())
+            totals.calls += sample.calls
+            totals.wall_time += sample.wall_time
+            totals.rows += sample.rows
+            totals.queries += sample.queries
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "wall_time_ms": round(1000 * (time.perf_counter() - self.started_at), 2),
+                "phases": {name: totals.as_dict() for name, totals in self.phases.items()},
+            }
@@ -0,0 +1,117 @@
+"""
+cProfile and tracemalloc reports for SWAPI syncs, split into fetch, apply and M2M sections.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import DefaultDict, Dict, Iterator, List, Optional
+
+# SyncMetrics phase -> profile section
+PROFILE_SECTIONS = {
+    "fetch": "fetch",
+    "prefetch": "apply",
+    "parse": "apply",
+    "upsert": "apply",
+    "cache_build": "apply",
+    "cache_update": "apply",
+    "m2m_sync": "m2m",
+}
+
+
+class SyncProfiler:
+    """
+    Profiles the SyncMetrics phases of a sync with one cProfile.Profile per section. tracemalloc
+    snapshots taken around each phase attribute the memory it retains to allocation sites (file:line).
+
+    Only the thread that created the profiler is profiled, since cProfile cannot follow work handed to worker
+    threads. Fetch pages sequentially while profiling.
+    """
+
+    def __init__(self, top: int = 30) -> None:
+        self.top = top
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.allocated_bytes: DefaultDict[str, Counter] = defaultdict(Counter)
+        self.allocated_blocks: DefaultDict[str, Counter] = defaultdict(Counter)
+        self.peak_memory: Dict[str, int] = {}
+        self._thread_id = threading.get_ident()
+        self._current: Optional[str] = None
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def section(self, phase: str) -> Iterator[None]:
+        """Profile the block under the section `phase` belongs to."""
+        if threading.get_ident() != self._thread_id or self._current is not None or not tracemalloc.is_tracing():
+            yield
+            return
+
+        name = PROFILE_SECTIONS.get(phase, phase)
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        self._current = name
+        before = self._snapshot()
+        tracemalloc.reset_peak()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.peak_memory[name] = max(self.peak_memory.get(name, 0), tracemalloc.get_traced_memory()[1])
+            for stat in self._snapshot().compare_to(before, "lineno"):
+                if stat.size_diff > 0:
+                    site = str(stat.traceback[0])
+                    self.allocated_bytes[name][site] += stat.size_diff
+                    self.allocated_blocks[name][site] += stat.count_diff
+            self._current = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+
+    def write_report(self, output_dir: str) -> List[str]:
+        """
+        Write `<section>.prof` (raw pstats, for snakeviz or pstats) for every section and a `report.txt` with
+        the hottest functions by cumulative and own time and the top allocation sites. Returns the paths written.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        report = io.StringIO()
+        for name, profile in self.profiles.items():
+            path = os.path.join(output_dir, f"{name}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+
+            report.write(f"===== {name} =====\n\n")
+            for sort_key in ("cumulative", "tottime"):
+                report.write(f"--- hot functions by {sort_key} time ---\n")
+                pstats.Stats(profile, stream=report).strip_dirs().sort_stats(sort_key).print_stats(self.top)
+            report.write(f"--- top allocation sites (peak traced memory {self.peak_memory.get(name, 0)} B) ---\n")
+            for site, size in self.allocated_bytes[name].most_common(self.top):
+                report.write(f"{size:>12} B {self.allocated_blocks[name][site]:>8} blocks  {site}\n")
+            report.write("\n")
+
+        path = os.path.join(output_dir, "report.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        paths.append(path)
+        return paths
@@ -0,0 +1,130 @@
+"""
+Scheduled SWAPI syncs that run on one node of the fleet at a time.
+
+Before syncing, a worker takes a database-wide lock: a session-level `pg_try_advisory_lock` on PostgreSQL, or
+a SyncLease row with an expiry on other databases (SQLite). A worker that cannot take the lock skips the run
+instead of fighting the lock holder over the same rows. Every run that takes the lock is recorded as a SyncRun.
+"""
+
+import hashlib
+import os
+import socket
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Callable, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import SyncLease, SyncRun
+from api.swapi_service import SWAPIService, SyncResult
+
+SYNC_LOCK_NAME = "swapi-sync"
+# SyncRun rows kept; older runs are pruned after every run
+SYNC_RUN_HISTORY = 100
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key for pg_advisory_lock derived from the lock name."""
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big", signed=True)
+
+
+@contextmanager
+def sync_lock(name: str = SYNC_LOCK_NAME, lease_seconds: Optional[float] = None) -> Iterator[bool]:
+    """
+    Try to take the cross-process sync lock without waiting; yields whether it was acquired.
+
+    The PostgreSQL advisory lock belongs to this thread's database session and is released on exit (or when the
+    session dies). The lease fallback expires after `lease_seconds` (default SWAPI_SYNC_LEASE_SECONDS), so a
+    crashed holder cannot block the fleet for longer than that; it must exceed the longest expected sync.
+    """
+    if connection.vendor == "postgresql":
+        key = advisory_lock_key(name)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+            acquired = cursor.fetchone()[0]
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+        return
+
+    if lease_seconds is None:
+        lease_seconds = getattr(settings, "SWAPI_SYNC_LEASE_SECONDS", 3600)
+    holder = worker_id()
+    acquired = _acquire_lease(name, holder, lease_seconds)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            SyncLease.objects.filter(name=name, holder=holder).update(holder="", expires_at=timezone.now())
+
+
+def _acquire_lease(name: str, holder: str, lease_seconds: float) -> bool:
+    """Claim the lease row with one conditional UPDATE, so two workers can never both see it as free."""
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=lease_seconds)
+    claimed = SyncLease.objects.filter(Q(expires_at__lte=now) | Q(holder=holder), name=name).update(
+        holder=holder, expires_at=expires_at
+    )
+    if claimed:
+        return True
+    try:
+        with transaction.atomic():
+            SyncLease.objects.create(name=name, holder=holder, expires_at=expires_at)
+    except IntegrityError:
+        # The row exists and another worker holds an unexpired lease
+        return False
+    return True
+
+
+def run_sync(service: SWAPIService, staged: bool = False) -> List[SyncResult]:
+    """Refresh films, starships and characters, either directly or through the staging tables."""
+    if staged:
+        return service.stage_and_publish(service.fetch_resources())
+    return [
+        service.fetch_and_store_films(),
+        service.fetch_and_store_starships(),
+        service.fetch_and_store_characters(),
+    ]
+
+
+def run_scheduled_sync(
+    sync: Optional[Callable[[], List[SyncResult]]] = None, lock_name: str = SYNC_LOCK_NAME
+) -> Optional[SyncRun]:
+    """
+    Run `sync` (default: run_sync with a new SWAPIService) if this process gets the sync lock, and record its
+    status, duration and results as a SyncRun. Returns None when another process holds the lock. Sync errors
+    are recorded on the run rather than raised, so a worker loop survives a failed refresh.
+    """
+    sync = sync or (lambda: run_sync(SWAPIService()))
+    with sync_lock(lock_name) as acquired:
+        if not acquired:
+            return None
+
+        run = SyncRun.objects.create(host=worker_id())
+        started_at = time.perf_counter()
+        try:
+            results = sync()
+        except Exception:
+            run.status, run.error = SyncRun.FAILED, traceback.format_exc()
+        else:
+            run.status, run.results = SyncRun.SUCCEEDED, [asdict(result) for result in results]
+        run.duration = time.perf_counter() - started_at
+        run.finished_at = timezone.now()
+        run.save(update_fields=["status", "error", "results", "duration", "finished_at"])
+
+    stale = SyncRun.objects.values_list("pk", flat=True)[SYNC_RUN_HISTORY:]
+    SyncRun.objects.filter(pk__in=list(stale)).delete()
+    return run
@@ -1,10 +1,17 @@
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from api.list_counts import estimated_count
 from api.models import Character, Film, Starship, Vote
+from api.swapi_service import SWAPIService
 
 User = get_user_model()
 
@@ -92,6 +99,55 @@ class CharacterApiViewTests(APITestCase):
         self.assertEqual(len(response.data["characters"]), 1)
         self.assertEqual(response.data["characters"][0]["name"], "Test Character")
 
+    def test_character_page_counts_votes_in_a_fixed_number_of_queries(self) -> None:
+        films = [
+            Film.objects.create(
+                title=f"Film {i}", swapi_url=f"https://swapi.dev/api/films/{i}/", release_date="2023-01-01", data={}
+            )
+            for i in range(1, 4)
+        ]
+        starship = Starship.objects.create(name="X-wing", swapi_url="https://swapi.dev/api/starships/12/", data={})
+        for i in range(3, 11):
+            character = Character.objects.create(
+                name=f"Extra {i}", swapi_url=f"https://swapi.dev/api/people/{i}/", data={}
+            )
+            character.films.set(films)
+            character.starships.add(starship)
+        self.character.films.set(films)
+        Vote.objects.create(user=self.user, character=self.character)
+        Vote.objects.create(user=self.user, film=films[0])
+        Vote.objects.create(user=self.user, starship=starship)
+
+        # Page count, page rows, then one prefetch each for films and starships
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("character-list"))
+
+        self.assertEqual(len(response.data["characters"]), 10)
+        character = next(item for item in response.data["characters"] if item["name"] == "Test Character")
+        self.assertEqual(character["votes"], 1)
+        self.assertEqual([film["votes"] for film in character["films"]], [1, 0, 0])
+        extra = next(item for item in response.data["characters"] if item["name"] == "Extra 3")
+        self.assertEqual(extra["votes"], 0)
+        self.assertEqual(extra["starships"][0]["votes"], 1)
+
+    def test_character_page_query_count_does_not_grow_with_page_size(self) -> None:
+        def page_queries() -> int:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse("character-list"))
+            return len(queries)
+
+        film = Film.objects.create(
+            title="Film", swapi_url="https://swapi.dev/api/films/9/", release_date="2023-01-01", data={}
+        )
+        self.character.films.add(film)
+        small_page = page_queries()
+        for i in range(3, 11):
+            Character.objects.create(
+                name=f"Extra {i}", swapi_url=f"https://swapi.dev/api/people/{i}/", data={}
+            ).films.add(film)
+
+        self.assertEqual(page_queries(), small_page)
+
 
 class StarshipApiViewTests(APITestCase):
     def setUp(self) -> None:
@@ -162,3 +218,135 @@ class VoteApiViewTests(APITestCase):
         self.assertEqual(Vote.objects.count(), 1)
         self.assertEqual(response.data["error"], "You have already voted for an item.")
         self.assertEqual(response.data["detail"], "UNIQUE constraint failed: api_vote.user_id, api_vote.film_id")
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        # Insertion order differs from name order, and names repeat so the id tiebreaker matters
+        for i in reversed(range(25)):
+            Starship.objects.create(
+                name=f"Ship {i // 2:02d}", swapi_url=f"https://swapi.dev/api/starships/{i}/", data={}
+            )
+        self.expected = list(Starship.objects.order_by("name", "id").values_list("id", flat=True))
+
+    def _page(self, **params: str) -> dict:
+        response = self.client.get(reverse("starship-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_walks_forward_and_back_in_sort_key_order(self) -> None:
+        first = self._page(pagination="cursor")
+        self.assertIsNone(first["pagination"]["prev"])
+        second = self._page(cursor=first["pagination"]["next"])
+        third = self._page(cursor=second["pagination"]["next"])
+
+        pages = [first, second, third]
+        self.assertEqual([ship["id"] for page in pages for ship in page["starships"]], self.expected)
+        self.assertIsNone(third["pagination"]["next"])
+
+        back = self._page(cursor=third["pagination"]["prev"])
+        self.assertEqual(back["starships"], second["starships"])
+        self.assertEqual(self._page(cursor=back["pagination"]["prev"])["starships"], first["starships"])
+
+    def test_pages_are_stable_while_rows_are_inserted(self) -> None:
+        first = self._page(pagination="cursor")
+        Starship.objects.create(name="Ship 00", swapi_url="https://swapi.dev/api/starships/100/", data={})
+
+        second = self._page(cursor=first["pagination"]["next"])
+
+        self.assertEqual([ship["id"] for ship in second["starships"]], self.expected[10:20])
+
+    def test_cursor_page_uses_no_count_or_offset(self) -> None:
+        cursor = self._page(pagination="cursor")["pagination"]["next"]
+
+        with CaptureQueriesContext(connection) as queries:
+            self._page(cursor=cursor)
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("OFFSET", queries[0]["sql"])
+
+    def test_cursor_page_counts_votes_without_grouping_the_page_query(self) -> None:
+        user = User.objects.create_user(
+            email="voter@example.com", username="voter", first_name="Test", last_name="Voter", password="testpass123"
+        )
+        Vote.objects.create(user=user, starship_id=self.expected[0])
+
+        with CaptureQueriesContext(connection) as queries:
+            page = self._page(pagination="cursor")
+
+        self.assertEqual([ship["votes"] for ship in page["starships"]], [1] + [0] * 9)
+        # The vote total is a correlated subquery: the page query itself neither joins votes nor groups rows
+        self.assertNotIn("JOIN", queries[0]["sql"])
+        self.assertEqual(queries[0]["sql"].count("GROUP BY"), 1)
+
+    def test_invalid_cursor_is_rejected(self) -> None:
+        response = self.client.get(reverse("starship-list"), {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_page_number_mode_is_unchanged(self) -> None:
+        page = self._page(page="3")
+
+        self.assertEqual(page["pagination"], {"total_pages": 3, "current_page": 3, "total_items": 25})
+        self.assertEqual(len(page["starships"]), 5)
+
+
+@override_settings(API_RESPONSE_CACHE_TIMEOUT=0, API_LIST_COUNT_CACHE_TIMEOUT=300)
+class ListCountTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        for i in range(1, 4):
+            Film.objects.create(
+                title=f"Film {i}", swapi_url=f"https://swapi.dev/api/films/{i}/", release_date="2023-01-01", data={}
+            )
+
+    def _pagination(self, **params: str) -> dict:
+        response = self.client.get(reverse("film-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["pagination"]
+
+    def test_total_is_counted_once_per_search_term(self) -> None:
+        with CaptureQueriesContext(connection) as first:
+            self.assertEqual(self._pagination()["total_items"], 3)
+        with CaptureQueriesContext(connection) as second:
+            self.assertEqual(self._pagination()["total_items"], 3)
+
+        self.assertEqual(len(second), len(first) - 1)
+        self.assertEqual(self._pagination(search="Film 2")["total_items"], 1)
+
+    @override_settings(API_LIST_COUNT_CACHE_TIMEOUT=0)
+    def test_total_is_counted_every_time_when_the_cache_is_disabled(self) -> None:
+        with CaptureQueriesContext(connection) as first:
+            self._pagination()
+        Film.objects.filter(title="Film 3").delete()
+        with CaptureQueriesContext(connection) as second:
+            self.assertEqual(self._pagination()["total_items"], 2)
+
+        self.assertEqual(len(second), len(first))
+
+    def test_committed_sync_invalidates_cached_totals(self) -> None:
+        self._pagination()
+        film = {"title": "Film 4", "release_date": "2023-01-01", "url": "https://swapi.dev/api/films/4/"}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SWAPIService().store_films([film])
+
+        self.assertEqual(self._pagination()["total_items"], 4)
+
+    @override_settings(API_LIST_COUNT_ESTIMATE=True)
+    def test_unfiltered_total_can_be_estimated(self) -> None:
+        with patch("api.list_counts.estimated_count", return_value=1000):
+            self.assertEqual(
+                self._pagination(),
+                {"total_pages": 100, "current_page": 1, "total_items": 1000, "estimated": True},
+            )
+            self.assertNotIn("estimated", self._pagination(search="Film"))
+
+    def test_unanalyzed_table_has_no_estimate(self) -> None:
+        for reltuples, expected in ((-1.0, None), (0.0, None), (1000.0, 1000)):
+            with self.subTest(reltuples=reltuples), patch("api.list_counts.connection") as pg_connection:
+                pg_connection.vendor = "postgresql"
+                pg_connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (reltuples,)
+                self.assertEqual(estimated_count(Film), expected)
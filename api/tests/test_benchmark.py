@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from api.benchmark import BenchmarkResult, compare_to_baseline, load_baseline, run_benchmark, save_baseline
+from api.models import Character
+from clients.fake_server import FakeSWAPIServerProcess, synthetic_dataset
+
+
+class SyntheticDatasetTests(TestCase):
+    def test_dataset_is_deterministic_and_consistent(self) -> None:
+        dataset = synthetic_dataset(250)
+
+        self.assertEqual(dataset, synthetic_dataset(250))
+        self.assertEqual([len(dataset[resource]) for resource in ("films", "starships", "people")], [6, 10, 250])
+        film_urls = {film["url"] for film in dataset["films"]}
+        starship_urls = {starship["url"] for starship in dataset["starships"]}
+        for person in dataset["people"]:
+            self.assertTrue(set(person["films"]) <= film_urls)
+            self.assertTrue(set(person["starships"]) <= starship_urls)
+
+    def test_server_process_cleans_up_when_it_fails_to_start(self) -> None:
+        server = FakeSWAPIServerProcess(10)
+        with patch("multiprocessing.process.BaseProcess.start", side_effect=OSError("cannot spawn")):
+            with self.assertRaises(OSError):
+                server.__enter__()
+
+        server.__exit__(None, None, None)
+        self.assertIsNone(server._process)
+        self.assertIsNone(server._conn)
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self) -> None:
+        self.baseline_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.baseline_dir, ignore_errors=True)
+        self.baseline_path = os.path.join(self.baseline_dir, "baseline.json")
+
+    def _result(self, wall_time: float = 1.0, queries: int = 30, peak_memory: int = 1000) -> BenchmarkResult:
+        return BenchmarkResult("sync", 1000, 1026, wall_time, queries, peak_memory, requests=103)
+
+    def test_run_benchmark_ingests_synthetic_dataset(self) -> None:
+        result = run_benchmark(30, mode="sync", page_size=10)
+
+        self.assertEqual(result.rows, 30 + 6 + 10)
+        self.assertEqual(Character.objects.count(), 30)
+        self.assertEqual(result.requests, 3 + 1 + 1)
+        self.assertGreater(result.queries, 0)
+        self.assertGreater(result.peak_memory, 0)
+
+    def test_baseline_round_trip(self) -> None:
+        save_baseline(self.baseline_path, [self._result()])
+
+        with open(self.baseline_path) as f:
+            self.assertEqual(json.load(f)["sync:1000"]["rows_per_second"], 1026.0)
+        self.assertEqual(load_baseline(self.baseline_path), {"sync:1000": self._result().as_dict()})
+
+    def test_compare_to_baseline_flags_regressions_beyond_threshold(self) -> None:
+        baseline = {"sync:1000": self._result().as_dict()}
+
+        self.assertEqual(compare_to_baseline(self._result(wall_time=1.1, queries=33), baseline, 0.2), [])
+        regressions = compare_to_baseline(self._result(wall_time=1.5, queries=40, peak_memory=2000), baseline, 0.2)
+        self.assertEqual(len(regressions), 3)
+        self.assertIn("throughput", regressions[0])
+        self.assertEqual(compare_to_baseline(self._result(wall_time=9), {}, 0.2), [])
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APITestCase
+
+from api.models import Film
+from api.response_cache import response_cache_stats
+from api.swapi_service import SWAPIService
+
+User = get_user_model()
+
+
+@override_settings(API_RESPONSE_CACHE_TIMEOUT=300)
+class ResponseCacheTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            first_name="Test", last_name="Tester", email="test@email.com", username="testuser", password="testpass"
+        )
+        self.film = Film.objects.create(
+            title="A New Hope", swapi_url="https://swapi.dev/api/films/1/", release_date="1977-05-25", data={}
+        )
+
+    def _films(self, **params: str) -> Response:
+        response = self.client.get(reverse("film-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_repeated_request_is_served_from_cache(self) -> None:
+        first = self._films()
+
+        with self.assertNumQueries(0):
+            second = self._films()
+
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(self._films(search="Hope")["X-Cache"], "MISS")
+        self.assertEqual(response_cache_stats()["films"], {"hits": 1, "misses": 2, "hit_rate": 0.3333})
+
+    def test_committed_vote_invalidates_cached_responses(self) -> None:
+        self._films()
+        self.client.force_authenticate(user=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("vote-create"), data={"film": self.film.id}, format="json")
+
+        response = self._films()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["films"][0]["votes"], 1)
+
+    def test_committed_sync_invalidates_cached_responses(self) -> None:
+        self._films()
+        film = {"title": "A New Hope (Special Edition)", "release_date": "1977-05-25", "url": self.film.swapi_url}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SWAPIService().store_films([film])
+
+        self.assertEqual(self._films().data["films"][0]["title"], "A New Hope (Special Edition)")
+
+    def test_works_with_the_file_backend(self) -> None:
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        backend = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": cache_dir}}
+
+        with override_settings(CACHES=backend):
+            first = self._films()
+            second = self._films()
+
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(second.data, first.data)
+
+    @override_settings(API_RESPONSE_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self) -> None:
+        self._films()
+
+        self.assertFalse(self._films().has_header("X-Cache"))
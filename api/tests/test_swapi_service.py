@@ -0,0 +1,693 @@
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from io import StringIO
+from typing import Any
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Character, Film, StagedCharacter, StagedFilm, Starship, SyncCheckpoint, Vote
+from api.snapshot import SnapshotError, read_snapshot, write_snapshot
+from api.staging import StagingValidationError
+from api.swapi_service import SWAPIService, SyncResult
+from api.sync_profiler import SyncProfiler
+from clients.async_swapi_client import AsyncSWAPIClient
+from clients.fake_server import FakeSWAPIServer
+from clients.swapi_client import SWAPIClient
+from clients.utils.exceptions import SWAPIClientError
+from clients.utils.stats import InstrumentedHTTPAdapter
+
+FILMS = [
+    {
+        "title": "A New Hope",
+        "release_date": "1977-05-25",
+        "url": "https://swapi.dev/api/films/1/",
+    },
+    {
+        "title": "The Empire Strikes Back",
+        "release_date": "1980-05-17",
+        "url": "https://swapi.dev/api/films/2/",
+    },
+]
+
+STARSHIPS = [
+    {"name": "X-wing", "url": "https://swapi.dev/api/starships/12/"},
+    {"name": "Millennium Falcon", "url": "https://swapi.dev/api/starships/10/"},
+]
+
+PEOPLE = [
+    {
+        "name": "Luke Skywalker",
+        "url": "https://swapi.dev/api/people/1/",
+        "films": ["https://swapi.dev/api/films/1/", "https://swapi.dev/api/films/2/"],
+        "starships": ["https://swapi.dev/api/starships/12/"],
+    },
+    {
+        "name": "Han Solo",
+        "url": "https://swapi.dev/api/people/14/",
+        "films": ["https://swapi.dev/api/films/1/"],
+        "starships": ["https://swapi.dev/api/starships/10/"],
+    },
+    {
+        "name": "C-3PO",
+        "url": "https://swapi.dev/api/people/2/",
+        "films": ["https://swapi.dev/api/films/2/"],
+        "starships": [],
+    },
+]
+
+# Requests against the local fake server should neither be throttled nor retried unless a test asks for it
+fake_server_settings = override_settings(SWAPI_RATE_LIMIT=0, SWAPI_MAX_RETRIES=0, SWAPI_CIRCUIT_BREAKER_THRESHOLD=0)
+
+
+@fake_server_settings
+class SWAPIServiceAsyncTests(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer({"films": FILMS, "starships": STARSHIPS, "people": PEOPLE}, page_size=2).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(AsyncSWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+        self.service = SWAPIService()
+
+    def test_fetch_and_store_all_async_syncs_every_resource(self) -> None:
+        self.service.fetch_and_store_all_async()
+
+        self.assertEqual(Film.objects.count(), 2)
+        self.assertEqual(Starship.objects.count(), 2)
+        self.assertEqual(Character.objects.count(), 3)
+        luke = Character.objects.get(swapi_url="https://swapi.dev/api/people/1/")
+        self.assertEqual(set(luke.films.values_list("title", flat=True)), {"A New Hope", "The Empire Strikes Back"})
+        self.assertEqual(list(luke.starships.values_list("name", flat=True)), ["X-wing"])
+
+    def test_afetch_resources_downloads_every_page(self) -> None:
+        resources_data = asyncio.run(self.service.afetch_resources())
+
+        self.assertEqual(len(resources_data["people"]), 3)
+        self.assertIn("/people/?page=2", self.server.requests)
+
+
+class SWAPIServiceTransactionTests(TestCase):
+    def setUp(self) -> None:
+        self.service = SWAPIService()
+        self.baseline_depth = len(connection.atomic_blocks)
+        self.depths: dict[str, int] = {}
+
+    def _record_depth(self, phase: str, result: Any) -> Any:
+        def side_effect(*args: Any, **kwargs: Any) -> Any:
+            self.depths[phase] = len(connection.atomic_blocks)
+            return result
+
+        return side_effect
+
+    def test_fetch_phase_runs_outside_the_apply_transaction(self) -> None:
+        with patch.object(self.service.client, "fetch_films", side_effect=self._record_depth("fetch", FILMS)):
+            self.service.fetch_and_store_films()
+
+        self.assertEqual(self.depths["fetch"], self.baseline_depth)
+        self.assertEqual(Film.objects.count(), 2)
+
+    def test_apply_phase_runs_in_its_own_transaction(self) -> None:
+        with patch.object(Film.objects, "bulk_create", side_effect=self._record_depth("apply", [])):
+            self.service.store_films(FILMS)
+
+        self.assertEqual(self.depths["apply"], self.baseline_depth + 1)
+
+
+class SWAPIServiceChangeDetectionTests(TestCase):
+    def setUp(self) -> None:
+        self.service = SWAPIService()
+        self.service.store_films(FILMS)
+        self.service.store_starships(STARSHIPS)
+        self.service.store_characters(PEOPLE)
+
+    def test_first_sync_reports_created_rows(self) -> None:
+        luke = Character.objects.get(swapi_url="https://swapi.dev/api/people/1/")
+
+        self.assertEqual(luke.films.count(), 2)
+        self.assertEqual(len(luke.content_hash), 64)
+
+    def test_noop_resync_writes_nothing(self) -> None:
+        service = SWAPIService()
+
+        with CaptureQueriesContext(connection) as context:
+            results = [
+                service.store_films(FILMS),
+                service.store_starships(STARSHIPS),
+                service.store_characters(PEOPLE),
+            ]
+
+        self.assertEqual([(r.created, r.updated, r.unchanged) for r in results], [(0, 0, 2), (0, 0, 2), (0, 0, 3)])
+        writes = [q["sql"] for q in context.captured_queries if q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))]
+        self.assertEqual(writes, [])
+
+    def test_only_changed_rows_are_updated(self) -> None:
+        people = [dict(PEOPLE[0], name="Luke Skywalker (Jedi)", films=["https://swapi.dev/api/films/1/"])] + PEOPLE[1:]
+
+        result = SWAPIService().store_characters(people)
+
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 1, 2))
+        luke = Character.objects.get(swapi_url="https://swapi.dev/api/people/1/")
+        self.assertEqual(luke.name, "Luke Skywalker (Jedi)")
+        self.assertEqual(list(luke.films.values_list("title", flat=True)), ["A New Hope"])
+
+    def test_new_films_relink_unchanged_characters(self) -> None:
+        new_film = {
+            "title": "Return of the Jedi",
+            "release_date": "1983-05-25",
+            "url": "https://swapi.dev/api/films/3/",
+        }
+        people = [dict(PEOPLE[2], films=[*PEOPLE[2]["films"], new_film["url"]])]
+        SWAPIService().store_characters(people)
+        self.assertEqual(Character.objects.get(swapi_url=PEOPLE[2]["url"]).films.count(), 1)
+
+        service = SWAPIService()
+        service.store_films(FILMS + [new_film])
+        result = service.store_characters(people)
+
+        self.assertEqual(result.unchanged, 1)
+        self.assertEqual(Character.objects.get(swapi_url=PEOPLE[2]["url"]).films.count(), 2)
+
+
+def _roster(size: int) -> list[dict]:
+    return [
+        {
+            "name": f"Clone Trooper {index}",
+            "url": f"https://swapi.dev/api/people/{1000 + index}/",
+            "films": [FILMS[index % 2]["url"]],
+            "starships": [STARSHIPS[index % 2]["url"]] if index % 3 else [],
+        }
+        for index in range(size)
+    ]
+
+
+class SWAPIServiceRelationSyncTests(TestCase):
+    def setUp(self) -> None:
+        self.service = SWAPIService()
+        self.service.store_films(FILMS)
+        self.service.store_starships(STARSHIPS)
+
+    def _count_queries(self, characters_data: list[dict]) -> int:
+        with CaptureQueriesContext(connection) as context:
+            self.service.store_characters(characters_data)
+        return len(context.captured_queries)
+
+    def test_relation_sync_query_count_is_constant(self) -> None:
+        # savepoint + release, existing-character prefetch, character insert,
+        # and one select + one insert per relation
+        with self.assertNumQueries(8):
+            self.service.store_characters(_roster(10))
+
+        self.assertEqual(self._count_queries(_roster(60)[10:]), 8)
+
+    def test_relation_sync_diffs_existing_links(self) -> None:
+        self.service.store_characters(_roster(30))
+        changed = [dict(character, films=[FILMS[1]["url"]], starships=[]) for character in _roster(30)]
+
+        # savepoint + release, existing-character prefetch, character update,
+        # and one select + one delete + one insert per relation (starships only deletes)
+        self.assertEqual(self._count_queries(changed), 9)
+
+        through = Character.films.through
+        self.assertEqual(through.objects.count(), 30)
+        self.assertFalse(through.objects.filter(film__swapi_url=FILMS[0]["url"]).exists())
+        self.assertFalse(Character.starships.through.objects.exists())
+
+    def test_relation_sync_skips_unknown_urls(self) -> None:
+        roster = [dict(_roster(1)[0], films=["https://swapi.dev/api/films/99/"])]
+
+        self.service.store_characters(roster)
+
+        self.assertFalse(Character.objects.get(swapi_url=roster[0]["url"]).films.exists())
+
+
+class SWAPIServiceUpsertTests(TestCase):
+    def setUp(self) -> None:
+        self.service = SWAPIService()
+        self.service.store_films(FILMS)
+        self.service.store_starships(STARSHIPS)
+
+    def test_upsert_writes_in_batches(self) -> None:
+        self.service.batch_size = 2
+
+        with CaptureQueriesContext(connection) as context:
+            result = self.service.store_characters(_roster(5))
+
+        inserts = [q["sql"] for q in context.captured_queries if q["sql"].startswith('INSERT INTO "api_character"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertTrue(all("ON CONFLICT" in sql for sql in inserts))
+        self.assertEqual((result.created, result.updated, result.unchanged), (5, 0, 0))
+        self.assertEqual(Character.objects.count(), 5)
+
+    def test_upsert_keeps_primary_keys_of_existing_rows(self) -> None:
+        film_ids = dict(Film.objects.values_list("swapi_url", "id"))
+        films = [dict(film, title=f"{film['title']} (Remastered)") for film in FILMS]
+
+        result = self.service.store_films(films)
+
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 2, 0))
+        self.assertEqual(dict(Film.objects.values_list("swapi_url", "id")), film_ids)
+        self.assertEqual(
+            set(Film.objects.values_list("title", flat=True)),
+            {"A New Hope (Remastered)", "The Empire Strikes Back (Remastered)"},
+        )
+
+    def test_relation_caches_map_urls_to_primary_keys_incrementally(self) -> None:
+        new_film = {
+            "title": "Return of the Jedi",
+            "release_date": "1983-05-25",
+            "url": "https://swapi.dev/api/films/3/",
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            self.service.store_films([new_film])
+
+        # The cache is updated from the upsert itself instead of reloading the films table
+        film_reads = [q["sql"] for q in context.captured_queries if q["sql"].startswith('SELECT "api_film"')]
+        self.assertEqual(len(film_reads), 1)
+        self.assertIn("WHERE", film_reads[0])
+        self.assertEqual(self.service.films_cache, dict(Film.objects.values_list("swapi_url", "id")))
+        self.assertEqual(self.service.starships_cache, dict(Starship.objects.values_list("swapi_url", "id")))
+
+
+@fake_server_settings
+class SWAPIServiceStreamingTests(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer(
+            {"films": FILMS, "starships": STARSHIPS, "people": _roster(25)}, page_size=5
+        ).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+        self.service = SWAPIService()
+        self.service.batch_size = 10
+        self.service.retry_backoff = 0
+
+    def test_stream_and_store_syncs_resources_in_chunks(self) -> None:
+        results = [self.service.stream_and_store(resource) for resource in ("films", "starships", "people")]
+
+        self.assertEqual([result.created for result in results], [2, 2, 25])
+        self.assertEqual(Character.films.through.objects.count(), 25)
+
+    def test_stream_and_store_commits_each_chunk(self) -> None:
+        self.service.stream_and_store("films")
+        self.service.stream_and_store("starships")
+        self.server.failures["/people/?page=4"] = 500
+        self.service.client.max_workers = 1
+
+        with (
+            patch.object(self.service, "_store_chunk", wraps=self.service._store_chunk) as store_chunk,
+            self.assertRaises(SWAPIClientError),
+        ):
+            self.service.stream_and_store("people")
+
+        # Pages 1-3 arrived before the failure: one full chunk of 10 was committed, the partial chunk was not
+        self.assertEqual(store_chunk.call_count, 1)
+        self.assertEqual(Character.objects.count(), 10)
+        self.assertEqual(self.server.requests.count("/people/?page=4"), self.service.page_retries + 1)
+
+    def test_stream_and_store_retries_transient_page_failures(self) -> None:
+        self.server.failures["/films/?page=1"] = [503, 502]
+
+        result = self.service.stream_and_store("films")
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(self.server.requests.count("/films/?page=1"), 3)
+
+    def test_stream_and_store_does_not_retry_client_errors(self) -> None:
+        self.server.failures["/films/?page=1"] = [404]
+
+        with self.assertRaises(SWAPIClientError):
+            self.service.stream_and_store("films")
+
+        self.assertEqual(self.server.requests.count("/films/?page=1"), 1)
+
+    def test_resume_continues_after_last_committed_page(self) -> None:
+        self.service.stream_and_store("films")
+        self.service.stream_and_store("starships")
+        self.service.client.max_workers = 1
+        self.service.page_retries = 0
+        self.server.failures["/people/?page=4"] = [500]
+        with self.assertRaises(SWAPIClientError):
+            self.service.stream_and_store("people")
+        self.assertEqual(SyncCheckpoint.objects.get(resource="people").last_page, 2)
+        self.server.requests.clear()
+
+        results = [SWAPIService().stream_and_store(resource, resume=True) for resource in ("films", "people")]
+
+        self.assertEqual(sorted(self.server.requests), ["/people/?page=3", "/people/?page=4", "/people/?page=5"])
+        self.assertEqual(results[1].created, 15)
+        self.assertEqual(Character.objects.count(), 25)
+        self.assertTrue(SyncCheckpoint.objects.get(resource="people").completed)
+
+    def test_new_run_discards_checkpoints_of_the_previous_run(self) -> None:
+        for resource in ("films", "starships", "people"):
+            self.service.stream_and_store(resource)
+        self.server.dataset["people"] = _roster(35)
+        self.service.page_retries = 0
+        self.server.failures["/starships/?page=1"] = [500]
+        self.service.stream_and_store("films")
+        with self.assertRaises(SWAPIClientError):
+            self.service.stream_and_store("starships")
+
+        results = [SWAPIService().stream_and_store(resource, resume=True) for resource in ("starships", "people")]
+
+        self.assertEqual(results[1].created, 10)
+        self.assertEqual(Character.objects.count(), 35)
+
+    def test_resume_after_a_finished_run_syncs_again(self) -> None:
+        call_command("fetch_swapi", "--stream", stdout=StringIO())
+        self.server.dataset["people"] = _roster(30)
+        out = StringIO()
+
+        call_command("fetch_swapi", "--resume", stdout=out)
+
+        self.assertIn("Films: 0 created, 0 updated, 2 unchanged", out.getvalue())
+        self.assertIn("Characters: 5 created, 0 updated, 25 unchanged", out.getvalue())
+        self.assertEqual(Character.objects.count(), 30)
+        self.assertTrue(SyncCheckpoint.objects.get(resource="people").completed)
+
+    def test_chunk_holding_the_last_page_completes_the_resource(self) -> None:
+        self.service.batch_size = 25
+
+        with patch.object(self.service, "_store_chunk", wraps=self.service._store_chunk) as store_chunk:
+            self.service.stream_and_store("people")
+
+        self.assertEqual(store_chunk.call_count, 1)
+        self.assertEqual(store_chunk.call_args.kwargs, {"completed": True})
+        self.assertEqual(SyncCheckpoint.objects.get(resource="people").last_page, 5)
+
+
+@fake_server_settings
+class SWAPIServiceSnapshotTests(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer({"films": FILMS, "starships": STARSHIPS, "people": PEOPLE}, page_size=2).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+        self.snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.snapshot_dir, ignore_errors=True)
+        self.path = os.path.join(self.snapshot_dir, "swapi.jsonl.gz")
+
+    def test_snapshot_round_trip_loads_without_network(self) -> None:
+        SWAPIService().export_snapshot(self.path)
+        Film.objects.all().delete()
+        Starship.objects.all().delete()
+        Character.objects.all().delete()
+        self.server.requests.clear()
+
+        results = SWAPIService().load_snapshot(self.path)
+
+        self.assertEqual([result.created for result in results], [2, 2, 3])
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(Character.objects.get(name="Luke Skywalker").films.count(), 2)
+
+    def test_snapshot_keeps_raw_payloads(self) -> None:
+        write_snapshot(self.path, {"films": FILMS, "starships": STARSHIPS, "people": PEOPLE})
+
+        self.assertEqual(read_snapshot(self.path), {"films": FILMS, "starships": STARSHIPS, "people": PEOPLE})
+
+    def test_read_snapshot_rejects_other_versions(self) -> None:
+        with gzip.open(self.path, "wt") as f:
+            f.write(json.dumps({"format": "swapi-snapshot", "version": 99, "counts": {}}) + "\n")
+
+        with self.assertRaisesMessage(SnapshotError, "Unsupported snapshot version 99"):
+            read_snapshot(self.path)
+
+    def test_read_snapshot_rejects_truncated_files(self) -> None:
+        write_snapshot(self.path, {"films": FILMS, "starships": STARSHIPS, "people": PEOPLE})
+        with gzip.open(self.path, "rt") as f:
+            lines = f.readlines()
+        with gzip.open(self.path, "wt") as f:
+            f.writelines(lines[:-1])
+
+        with self.assertRaisesMessage(SnapshotError, "is incomplete"):
+            read_snapshot(self.path)
+
+
+@fake_server_settings
+class SWAPIServiceOrchestrationTests(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer(
+            {"films": FILMS, "starships": STARSHIPS, "people": PEOPLE}, page_size=1, latency=0.05
+        ).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+        self.service = SWAPIService()
+        self.service.client.max_workers = 1
+
+    def test_sync_orchestrated_downloads_resources_in_parallel(self) -> None:
+        report = self.service.sync_orchestrated()
+
+        self.assertEqual([result.created for result in report.results], [2, 2, 3])
+        self.assertEqual(Character.objects.get(name="Luke Skywalker").films.count(), 2)
+        self.assertEqual(self.server.max_in_flight, 3)
+        self.assertEqual(list(report.timings), ["fetch", "apply films and starships", "apply characters"])
+
+    @override_settings(SWAPI_FETCH_WORKERS=4, SWAPI_POOL_MAXSIZE=4)
+    def test_pool_holds_a_connection_for_every_fetching_thread(self) -> None:
+        service = SWAPIService()
+        service.sync_orchestrated()
+
+        adapter = service.client.session.get_adapter(self.server.base_url)
+        assert isinstance(adapter, InstrumentedHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 12)
+        self.assertEqual(Character.objects.count(), 3)
+
+    def test_characters_are_applied_after_films_and_starships(self) -> None:
+        both_started = threading.Barrier(2, timeout=5)
+        order = []
+
+        def store(label: str) -> Any:
+            def side_effect(data: list) -> SyncResult:
+                # Both stores must be running at the same time to get past the barrier
+                both_started.wait()
+                order.append(label)
+                return SyncResult(label)
+
+            return side_effect
+
+        with (
+            patch.object(self.service, "store_films", side_effect=store("Films")),
+            patch.object(self.service, "store_starships", side_effect=store("Starships")),
+            patch.object(self.service, "store_characters", side_effect=lambda data: order.append("Characters")),
+        ):
+            self.service.sync_orchestrated(concurrent_apply=True)
+
+        self.assertEqual(sorted(order[:2]), ["Films", "Starships"])
+        self.assertEqual(order[2], "Characters")
+
+
+@fake_server_settings
+class SWAPIServiceMetricsTests(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer({"films": FILMS, "starships": STARSHIPS, "people": PEOPLE}, page_size=2).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+        self.service = SWAPIService()
+
+    def test_every_phase_is_recorded(self) -> None:
+        results = [
+            self.service.fetch_and_store_films(),
+            self.service.fetch_and_store_starships(),
+            self.service.fetch_and_store_characters(),
+        ]
+
+        report = json.loads(json.dumps(self.service.metrics_report(results)))
+
+        phases = report["phases"]
+        self.assertEqual(
+            set(phases), {"fetch", "prefetch", "parse", "upsert", "m2m_sync", "cache_build", "cache_update"}
+        )
+        self.assertEqual(phases["fetch"]["rows"], 7)
+        self.assertEqual(phases["parse"]["rows"], 7)
+        self.assertEqual(phases["upsert"]["queries"], 3)
+        # 3 characters with 4 film links and 2 starship links
+        self.assertEqual(phases["m2m_sync"]["rows"], 6)
+        self.assertEqual(report["results"][2], {"resource": "Characters", "created": 3, "updated": 0, "unchanged": 0})
+        self.assertEqual(report["http"]["requests"], 4)
+
+    def test_streaming_records_each_page_fetch(self) -> None:
+        self.service.stream_and_store("people")
+
+        self.assertEqual(self.service.metrics.phases["fetch"].calls, 2)
+        self.assertEqual(self.service.metrics.phases["fetch"].rows, 3)
+
+
+@fake_server_settings
+class SWAPIServiceProfilingTests(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer({"films": FILMS, "starships": STARSHIPS, "people": PEOPLE}, page_size=2).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        self.service = SWAPIService()
+        self.service.client.max_workers = 1
+
+    def test_profile_report_has_fetch_apply_and_m2m_sections(self) -> None:
+        profiler = SyncProfiler()
+        self.service.metrics.profiler = profiler
+        profiler.start()
+        try:
+            self.service.fetch_and_store_films()
+            self.service.fetch_and_store_starships()
+            self.service.fetch_and_store_characters()
+        finally:
+            profiler.stop()
+
+        paths = profiler.write_report(self.output_dir)
+
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in paths), ["apply.prof", "fetch.prof", "m2m.prof", "report.txt"]
+        )
+        with open(os.path.join(self.output_dir, "report.txt")) as f:
+            report = f.read()
+        apply_section = report.split("===== apply =====")[1].split("===== m2m =====")[0]
+        self.assertIn("_strptime", apply_section)
+        self.assertIn("top allocation sites", apply_section)
+
+
+@fake_server_settings
+class SWAPIServiceResyncTests(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer({"films": FILMS, "starships": STARSHIPS, "people": PEOPLE}).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+        self.service = SWAPIService()
+        self.service.store_films(FILMS)
+        self.service.store_starships(STARSHIPS)
+        self.service.store_characters(PEOPLE)
+
+    def test_resync_urls_rewrites_only_the_requested_rows(self) -> None:
+        luke_url, empire_url = str(PEOPLE[0]["url"]), str(FILMS[1]["url"])
+        luke = Character.objects.get(swapi_url=luke_url)
+        luke.name = "Corrupted"
+        luke.save()
+        luke.films.clear()
+        Film.objects.filter(swapi_url=FILMS[1]["url"]).update(title="Corrupted")
+        self.server.requests.clear()
+
+        results = self.service.resync_urls([luke_url, luke_url, empire_url])
+
+        self.assertEqual(sorted(self.server.requests), ["/films/2/", "/people/1/"])
+        self.assertEqual([(result.resource, result.updated) for result in results], [("Films", 1), ("Characters", 1)])
+        luke.refresh_from_db()
+        self.assertEqual(luke.name, "Luke Skywalker")
+        self.assertEqual(luke.films.count(), 2)
+        self.assertEqual(Film.objects.get(swapi_url=FILMS[1]["url"]).title, "The Empire Strikes Back")
+
+    def test_resync_urls_rejects_non_swapi_urls(self) -> None:
+        with self.assertRaises(ValueError):
+            self.service.resync_urls(["https://swapi.dev/api/vehicles/4/"])
+
+        self.assertEqual(self.server.requests, [])
+
+
+class SWAPIServiceStagingTests(TestCase):
+    def setUp(self) -> None:
+        self.service = SWAPIService()
+        self.service.store_films(FILMS)
+        self.service.store_starships(STARSHIPS)
+        self.service.store_characters(PEOPLE)
+
+    def _resources(self, **overrides: list) -> dict:
+        return {"films": FILMS, "starships": STARSHIPS, "people": PEOPLE, **overrides}
+
+    def test_staged_sync_merges_changes_and_keeps_primary_keys(self) -> None:
+        character_ids = dict(Character.objects.values_list("swapi_url", "id"))
+        people = [
+            dict(PEOPLE[0], name="Luke Skywalker (Jedi)", films=[FILMS[1]["url"]]),
+            *PEOPLE[1:],
+            {"name": "Leia Organa", "url": "https://swapi.dev/api/people/5/", "films": [], "starships": []},
+        ]
+
+        results = self.service.stage_and_publish(self._resources(people=people))
+
+        self.assertEqual(
+            [(result.created, result.updated, result.unchanged) for result in results],
+            [(0, 0, 2), (0, 0, 2), (1, 1, 2)],
+        )
+        luke = Character.objects.get(swapi_url=PEOPLE[0]["url"])
+        self.assertEqual(luke.id, character_ids[PEOPLE[0]["url"]])
+        self.assertEqual(luke.name, "Luke Skywalker (Jedi)")
+        self.assertEqual(list(luke.films.values_list("swapi_url", flat=True)), [FILMS[1]["url"]])
+        self.assertEqual(list(luke.starships.values_list("swapi_url", flat=True)), [STARSHIPS[0]["url"]])
+        self.assertEqual(Character.objects.get(swapi_url=PEOPLE[1]["url"]).films.count(), 1)
+        self.assertFalse(StagedCharacter.objects.exists())
+
+    def test_staged_sync_publishes_in_one_transaction(self) -> None:
+        with patch("api.swapi_service.merge_staged_links", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.service.stage_and_publish(self._resources(films=[dict(FILMS[0], title="Changed")]))
+
+        self.assertEqual(Film.objects.get(swapi_url=FILMS[0]["url"]).title, "A New Hope")
+        self.assertFalse(StagedFilm.objects.exists())
+
+    def test_staged_sync_rejects_links_to_unknown_films(self) -> None:
+        people = [dict(PEOPLE[0], films=["https://swapi.dev/api/films/99/"])]
+
+        with self.assertRaisesMessage(StagingValidationError, "https://swapi.dev/api/films/99/"):
+            self.service.stage_and_publish(self._resources(people=people))
+
+        self.assertEqual(Character.objects.get(swapi_url=PEOPLE[0]["url"]).films.count(), 2)
+
+    def test_staged_sync_keeps_votes_valid(self) -> None:
+        user = get_user_model().objects.create_user(
+            email="voter@example.com", username="voter", first_name="Test", last_name="Voter", password="testpass123"
+        )
+        vote = Vote.objects.create(user=user, character=Character.objects.get(swapi_url=PEOPLE[0]["url"]))
+
+        self.service.stage_and_publish(self._resources(people=[dict(PEOPLE[0], name="Renamed"), *PEOPLE[1:]]))
+
+        vote.refresh_from_db()
+        self.assertEqual(vote.character.name, "Renamed")
+
+
+class FetchSwapiCommandTests(TestCase):
+    def test_conflicting_sync_modes_are_rejected(self) -> None:
+        for flags, message in (
+            (["--stream", "--parallel"], "--parallel cannot be combined with --stream"),
+            (["--resume", "--async"], "--async cannot be combined with --resume"),
+            (["--staged", "--export-snapshot", "snapshot.gz"], "--staged cannot be combined with --export-snapshot"),
+            (["--url", FILMS[0]["url"], "--async"], "--url cannot be combined with --async"),
+            (["--staged", "--from-snapshot", "snapshot.gz", "--async"], "--from-snapshot cannot be combined with"),
+            (["--profile", "--workers", "8"], "--profile fetches pages sequentially"),
+        ):
+            with self.subTest(flags=flags), patch.object(SWAPIService, "fetch_resources") as fetch_resources:
+                with self.assertRaisesMessage(CommandError, message):
+                    call_command("fetch_swapi", *flags)
+                fetch_resources.assert_not_called()
+
+    def test_metrics_json_on_stdout_keeps_progress_on_stderr(self) -> None:
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, ignore_errors=True)
+        path = os.path.join(snapshot_dir, "snapshot.jsonl.gz")
+        write_snapshot(path, {"films": FILMS, "starships": STARSHIPS, "people": PEOPLE})
+        out, err = StringIO(), StringIO()
+
+        call_command("fetch_swapi", "--from-snapshot", path, "--metrics-json", "-", stdout=out, stderr=err)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual([result["created"] for result in report["results"]], [2, 2, 3])
+        self.assertIn(f"Loading snapshot {path}...", err.getvalue())
+        self.assertIn("SWAPI data sync complete!", err.getvalue())
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.models import Character, SyncLease, SyncRun
+from api.swapi_service import SyncResult
+from api.sync_worker import SYNC_LOCK_NAME, run_scheduled_sync, sync_lock
+from clients.fake_server import FakeSWAPIServer, synthetic_dataset
+from clients.swapi_client import SWAPIClient
+
+
+class SyncLockTests(TestCase):
+    def test_lease_admits_one_holder_until_released(self) -> None:
+        with sync_lock() as acquired:
+            self.assertTrue(acquired)
+            with patch("api.sync_worker.worker_id", return_value="other-node:1"):
+                with sync_lock() as acquired_elsewhere:
+                    self.assertFalse(acquired_elsewhere)
+
+        with patch("api.sync_worker.worker_id", return_value="other-node:1"):
+            with sync_lock() as acquired_elsewhere:
+                self.assertTrue(acquired_elsewhere)
+
+    def test_expired_lease_can_be_taken_over(self) -> None:
+        SyncLease.objects.create(
+            name=SYNC_LOCK_NAME, holder="crashed-node:1", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        with sync_lock() as acquired:
+            self.assertTrue(acquired)
+            self.assertNotEqual(SyncLease.objects.get(name=SYNC_LOCK_NAME).holder, "crashed-node:1")
+
+
+class ScheduledSyncTests(TestCase):
+    def test_successful_run_is_recorded(self) -> None:
+        run = run_scheduled_sync(lambda: [SyncResult("films", created=2)])
+
+        assert run is not None
+        run.refresh_from_db()
+        self.assertEqual(run.status, SyncRun.SUCCEEDED)
+        self.assertIsNotNone(run.finished_at)
+        self.assertGreaterEqual(run.duration, 0)
+        self.assertEqual(run.results, [{"resource": "films", "created": 2, "updated": 0, "unchanged": 0}])
+
+    def test_failed_run_is_recorded_with_its_error(self) -> None:
+        def sync() -> list:
+            raise RuntimeError("SWAPI is down")
+
+        run = run_scheduled_sync(sync)
+
+        assert run is not None
+        run.refresh_from_db()
+        self.assertEqual(run.status, SyncRun.FAILED)
+        self.assertIn("SWAPI is down", run.error)
+        self.assertFalse(SyncLease.objects.exclude(holder="").exists())
+
+    def test_run_is_skipped_while_another_node_holds_the_lock(self) -> None:
+        SyncLease.objects.create(
+            name=SYNC_LOCK_NAME, holder="other-node:1", expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+        self.assertIsNone(run_scheduled_sync(lambda: self.fail("sync must not run")))
+        self.assertFalse(SyncRun.objects.exists())
+
+    @override_settings(SWAPI_RATE_LIMIT=0, SWAPI_MAX_RETRIES=0, SWAPI_CIRCUIT_BREAKER_THRESHOLD=0)
+    def test_worker_command_syncs_once(self) -> None:
+        dataset = synthetic_dataset(15)
+        out = StringIO()
+        with FakeSWAPIServer(dataset) as server, patch.object(SWAPIClient, "BASE_URL", server.base_url):
+            call_command("sync_worker", "--once", stdout=out)
+
+        self.assertIn("SWAPI sync succeeded", out.getvalue())
+        self.assertEqual(Character.objects.count(), 15)
+        self.assertEqual(SyncRun.objects.get().status, SyncRun.SUCCEEDED)
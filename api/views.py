@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
@@ -11,7 +11,46 @@ from rest_framework.views import APIView
 from api.serializers import CharacterSerializer, FilmSerializer, StarshipSerializer, VoteSerializer
 
 from .exceptions import UniqueConstraintError
-from .fetch_db_data_service import DatabaseServiceException, FetchDBDataService
+from .fetch_db_data_service import DatabaseServiceException, FetchDBDataService, InvalidCursorError
+from .response_cache import cached_response
+
+CURSOR_PARAMETERS = [
+    OpenApiParameter(
+        name="pagination",
+        type=str,
+        enum=["page", "cursor"],
+        description="Set to `cursor` for keyset pagination with opaque `next` / `prev` cursors",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="cursor",
+        type=str,
+        description="Cursor from a previous response's `next` or `prev` (implies `pagination=cursor`)",
+        required=False,
+    ),
+]
+
+
+def list_query_params(request: Request) -> Tuple[int, Optional[str], Optional[str]]:
+    """Page number, search query and cursor of a list request; the cursor is None in page-number mode."""
+    cursor = request.query_params.get("cursor")
+    if cursor is None and request.query_params.get("pagination") == "cursor":
+        cursor = ""
+    return int(request.query_params.get("page", 1)), request.query_params.get("search", None), cursor
+
+
+def pagination_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    if "next" in data:
+        return {"next": data["next"], "prev": data["prev"]}
+    pagination = {
+        "total_pages": data["total_pages"],
+        "current_page": data["current_page"],
+        "total_items": data["total_items"],
+    }
+    if data.get("estimated"):
+        # total_items (and so total_pages) come from planner statistics, not COUNT(*)
+        pagination["estimated"] = True
+    return pagination
 
 
 class FilmApiView(APIView):
@@ -29,17 +68,18 @@ class FilmApiView(APIView):
                 name="page", type=int, description="Page number for pagination", required=False, default=1
             ),
             OpenApiParameter(name="search", type=str, description="Search query for film titles", required=False),
+            *CURSOR_PARAMETERS,
         ],
     )
+    @cached_response("films")
     def get(self, request: Request) -> Response:
         """List all films with pagination and optional search."""
         try:
             # Get query parameters
-            page = int(request.query_params.get("page", 1))
-            search_query = request.query_params.get("search", None)
+            page, search_query, cursor = list_query_params(request)
 
             # Get paginated films data from service
-            films_data = FetchDBDataService.get_films(page=page, search_query=search_query)
+            films_data = FetchDBDataService.get_films(page=page, search_query=search_query, cursor=cursor)
 
             # Serialize the film instances
             serializer = FilmSerializer(films_data["items"], many=True)
@@ -47,16 +87,14 @@ class FilmApiView(APIView):
             return Response(
                 {
                     "films": serializer.data,
-                    "pagination": {
-                        "total_pages": films_data["total_pages"],
-                        "current_page": films_data["current_page"],
-                        "total_items": films_data["total_items"],
-                    },
+                    "pagination": pagination_data(films_data),
                 }
             )
 
         except DatabaseServiceException as e:
             return Response({"error": f"Database error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except InvalidCursorError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except ValueError as e:
             return Response({"error": f"Invalid page number {e}"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -80,17 +118,18 @@ class StarshipApiView(APIView):
                 name="page", type=int, description="Page number for pagination", required=False, default=1
             ),
             OpenApiParameter(name="search", type=str, description="Search query for starship names", required=False),
+            *CURSOR_PARAMETERS,
         ],
     )
+    @cached_response("starships")
     def get(self, request: Request) -> Response:
         """List all starships with pagination and optional search."""
         try:
             # Get query parameters
-            page = int(request.query_params.get("page", 1))
-            search_query = request.query_params.get("search", None)
+            page, search_query, cursor = list_query_params(request)
 
             # Get paginated starships data from service
-            starships_data = FetchDBDataService.get_starships(page=page, search_query=search_query)
+            starships_data = FetchDBDataService.get_starships(page=page, search_query=search_query, cursor=cursor)
 
             # Serialize the starship instances
             serializer = StarshipSerializer(starships_data["items"], many=True)
@@ -98,16 +137,14 @@ class StarshipApiView(APIView):
             return Response(
                 {
                     "starships": serializer.data,
-                    "pagination": {
-                        "total_pages": starships_data["total_pages"],
-                        "current_page": starships_data["current_page"],
-                        "total_items": starships_data["total_items"],
-                    },
+                    "pagination": pagination_data(starships_data),
                 }
             )
 
         except DatabaseServiceException as e:
             return Response({"error": f"Database error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except InvalidCursorError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except ValueError as e:
             return Response({"error": f"Invalid page number {e}"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -131,17 +168,18 @@ class CharacterApiView(APIView):
                 name="page", type=int, description="Page number for pagination", required=False, default=1
             ),
             OpenApiParameter(name="search", type=str, description="Search query for character names", required=False),
+            *CURSOR_PARAMETERS,
         ],
     )
+    @cached_response("characters")
     def get(self, request: Request) -> Response:
         """List all characters with pagination and optional search."""
         try:
             # Get query parameters
-            page = int(request.query_params.get("page", 1))
-            search_query = request.query_params.get("search", None)
+            page, search_query, cursor = list_query_params(request)
 
             # Get paginated characters data from service
-            characters_data = FetchDBDataService.get_characters(page=page, search_query=search_query)
+            characters_data = FetchDBDataService.get_characters(page=page, search_query=search_query, cursor=cursor)
 
             # Serialize the character instances
             serializer = CharacterSerializer(characters_data["items"], many=True)
@@ -149,16 +187,14 @@ class CharacterApiView(APIView):
             return Response(
                 {
                     "characters": serializer.data,
-                    "pagination": {
-                        "total_pages": characters_data["total_pages"],
-                        "current_page": characters_data["current_page"],
-                        "total_items": characters_data["total_items"],
-                    },
+                    "pagination": pagination_data(characters_data),
                 }
             )
 
         except DatabaseServiceException as e:
             return Response({"error": f"Database error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except InvalidCursorError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except ValueError as e:
             return Response({"error": f"Invalid page number {e}"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
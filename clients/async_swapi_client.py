@@ -0,0 +1,144 @@
+import asyncio
+import math
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+from clients.utils.error_handling import async_swapi_client_error_handler
+from clients.utils.retry import RetryPolicy
+from clients.utils.throttling import CircuitBreaker, TokenBucket
+
+
+class AsyncSWAPIClient:
+    """
+    An asyncio client for the Star Wars API (SWAPI).
+
+    Every request goes through one semaphore, so `max_concurrency` bounds the number of in-flight
+    requests across all resources fetched at the same time. Retries, rate limiting and the circuit breaker
+    follow the same policy objects as SWAPIClient, and may be shared with one.
+    """
+
+    BASE_URL = os.environ.get("SWAPI_BASE_URL", "https://swapi.dev/api")
+    RESOURCES = ("films", "starships", "people")
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        disable_ssl_verification: bool = False,
+        max_concurrency: int = 8,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.client = client or httpx.AsyncClient(timeout=10, verify=not disable_ssl_verification)
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=0)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncSWAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @async_swapi_client_error_handler
+    async def fetch_resource(self, resource: str, page: int = 1) -> dict:
+        """Fetch a specific resource from SWAPI, paginated by page number."""
+        resp = await self._get(f"{self.BASE_URL}/{resource}/?page={page}")
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _get(self, url: str) -> httpx.Response:
+        """
+        GET `url` through the rate limiter and circuit breaker, retrying transport errors and retryable statuses
+        (429, 5xx) with jittered exponential backoff, or after `Retry-After` when upstream sends one. Backoff
+        waits do not hold the concurrency semaphore.
+        """
+        attempt = 0
+        while True:
+            if self.circuit_breaker:
+                self.circuit_breaker.before_request()
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async()
+
+            try:
+                async with self.semaphore:
+                    resp = await self.client.get(url)
+            except httpx.TransportError:
+                self._record_upstream_failure()
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                continue
+            except Exception:
+                # Settle a half-open circuit whatever went wrong with its trial request
+                self._record_upstream_failure()
+                raise
+
+            if resp.status_code not in self.retry_policy.status_codes:
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_success()
+                return resp
+
+            self._record_upstream_failure()
+            if attempt >= self.retry_policy.max_retries:
+                return resp
+            attempt += 1
+            await asyncio.sleep(self.retry_policy.delay(attempt, resp.headers.get("Retry-After")))
+
+    def _record_upstream_failure(self) -> None:
+        if self.circuit_breaker:
+            self.circuit_breaker.record_failure()
+
+    async def fetch_all(self, resource: str) -> list[Any]:
+        """Fetch all items for a SWAPI resource; pages after the first are fetched concurrently, in page order."""
+        first_page = await self.fetch_resource(resource, page=1)
+        results = list(first_page.get("results", []))
+        if not first_page.get("next"):
+            return results
+
+        count = first_page.get("count") or 0
+        page_size = len(results)
+        if not page_size or count <= page_size:
+            # Without a usable count or page size we cannot plan the pages, so follow `next` instead
+            page = 1
+            data = first_page
+            while data.get("next"):
+                page += 1
+                data = await self.fetch_resource(resource, page=page)
+                results.extend(data.get("results", []))
+            return results
+
+        pages = await asyncio.gather(
+            *(self.fetch_resource(resource, page=page) for page in range(2, math.ceil(count / page_size) + 1))
+        )
+        for data in pages:
+            results.extend(data.get("results", []))
+        return results
+
+    async def fetch_people(self) -> list[Any]:
+        return await self.fetch_all("people")
+
+    async def fetch_films(self) -> list[Any]:
+        return await self.fetch_all("films")
+
+    async def fetch_starships(self) -> list[Any]:
+        return await self.fetch_all("starships")
+
+    async def fetch_everything(self) -> Dict[str, list[Any]]:
+        """Pull the pages of films, starships and people at the same time."""
+        results = await asyncio.gather(*(self.fetch_all(resource) for resource in self.RESOURCES))
+        return dict(zip(self.RESOURCES, results))
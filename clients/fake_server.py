@@ -0,0 +1,302 @@
+import gzip
+import hashlib
+import json
+import multiprocessing
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+SYNTHETIC_BASE_URL = "https://swapi.dev/api"
+
+
+def synthetic_dataset(
+    characters: int, films: Optional[int] = None, starships: Optional[int] = None, seed: int = 0
+) -> Dict[str, List[dict]]:
+    """
+    Generate a SWAPI-shaped dataset of `characters` people, linked to `films` films and `starships` starships
+    (by default scaled with the number of characters). The same arguments always produce the same dataset.
+    """
+    rng = random.Random(seed)
+    films = films or max(6, characters // 500)
+    starships = starships or max(10, characters // 50)
+    film_urls = [f"{SYNTHETIC_BASE_URL}/films/{index}/" for index in range(1, films + 1)]
+    starship_urls = [f"{SYNTHETIC_BASE_URL}/starships/{index}/" for index in range(1, starships + 1)]
+    timestamp = "2014-12-09T13:50:51.644000Z"
+
+    people = []
+    film_characters: Dict[str, List[str]] = {url: [] for url in film_urls}
+    for index in range(1, characters + 1):
+        url = f"{SYNTHETIC_BASE_URL}/people/{index}/"
+        linked_films = rng.sample(film_urls, min(len(film_urls), rng.randint(1, 4)))
+        for film_url in linked_films:
+            film_characters[film_url].append(url)
+        people.append(
+            {
+                "name": f"Synthetic Character {index}",
+                "height": str(rng.randint(60, 230)),
+                "mass": str(rng.randint(20, 160)),
+                "hair_color": rng.choice(["blond", "brown", "black", "none"]),
+                "skin_color": rng.choice(["fair", "gold", "white, blue", "green"]),
+                "eye_color": rng.choice(["blue", "yellow", "red", "brown"]),
+                "birth_year": f"{rng.randint(1, 900)}BBY",
+                "gender": rng.choice(["male", "female", "n/a"]),
+                "homeworld": f"{SYNTHETIC_BASE_URL}/planets/{rng.randint(1, 60)}/",
+                "films": linked_films,
+                "species": [],
+                "vehicles": [],
+                "starships": rng.sample(starship_urls, min(len(starship_urls), rng.randint(0, 3))),
+                "created": timestamp,
+                "edited": timestamp,
+                "url": url,
+            }
+        )
+
+    return {
+        "films": [
+            {
+                "title": f"Synthetic Film {index}",
+                "episode_id": index,
+                "opening_crawl": " ".join(
+                    rng.choice(["A long time ago", "in a galaxy", "far, far away..."]) for _ in range(60)
+                ),
+                "director": "George Lucas",
+                "producer": "Gary Kurtz, Rick McCallum",
+                "release_date": f"{1977 + index % 40}-05-25",
+                "characters": film_characters[url],
+                "created": timestamp,
+                "edited": timestamp,
+                "url": url,
+            }
+            for index, url in enumerate(film_urls, start=1)
+        ],
+        "starships": [
+            {
+                "name": f"Synthetic Starship {index}",
+                "model": f"SX-{index}",
+                "manufacturer": "Corellian Engineering Corporation",
+                "cost_in_credits": str(rng.randint(10_000, 10_000_000)),
+                "length": str(rng.randint(10, 2000)),
+                "crew": str(rng.randint(1, 5000)),
+                "passengers": str(rng.randint(0, 600)),
+                "hyperdrive_rating": f"{rng.choice([0.5, 1.0, 2.0, 4.0])}",
+                "starship_class": rng.choice(["Starfighter", "Light freighter", "Star Destroyer"]),
+                "created": timestamp,
+                "edited": timestamp,
+                "url": url,
+            }
+            for index, url in enumerate(starship_urls, start=1)
+        ],
+        "people": people,
+    }
+
+
+class FakeSWAPIServer:
+    """
+    A local stand-in for SWAPI serving `/<resource>/?page=N` with SWAPI-style pagination, and `/<resource>/<id>/`
+    detail endpoints for items whose `url` ends that way.
+
+    Usage:
+        with FakeSWAPIServer({"films": [...], "people": [...]}) as server:
+            client = SWAPIClient()
+            client.BASE_URL = server.base_url
+    """
+
+    def __init__(
+        self,
+        dataset: Dict[str, List[dict]],
+        page_size: int = 10,
+        latency: float = 0.0,
+        failures: Optional[Dict[str, Union[int, List[int]]]] = None,
+    ) -> None:
+        self.dataset = dataset
+        self.page_size = page_size
+        # Seconds to sleep before answering each request, to simulate a slow upstream link
+        self.latency = latency
+        # Maps a request path such as "/films/?page=2" to the HTTP status it should fail with, or to a list of
+        # statuses consumed one request at a time (the path succeeds once the list is empty)
+        self.failures = failures or {}
+        self.requests: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSWAPIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "FakeSWAPIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def render_page(self, resource: str, page: int) -> Optional[dict]:
+        """Build the SWAPI-style payload for one page, or None if the resource or page does not exist."""
+        if resource not in self.dataset:
+            return None
+        items = self.dataset[resource]
+        start, end = (page - 1) * self.page_size, page * self.page_size
+        if page < 1 or (start >= len(items) and page != 1):
+            return None
+        has_next = end < len(items)
+        return {
+            "count": len(items),
+            "next": f"{self.base_url}/{resource}/?page={page + 1}" if has_next else None,
+            "previous": f"{self.base_url}/{resource}/?page={page - 1}" if page > 1 else None,
+            "results": items[start:end],
+        }
+
+    def render_item(self, resource: str, item_id: str) -> Optional[dict]:
+        """Find the item of `resource` whose `url` ends in `/<resource>/<item_id>/`, like a SWAPI detail endpoint."""
+        suffix = f"/{resource}/{item_id}/"
+        return next((item for item in self.dataset.get(resource, []) if item.get("url", "").endswith(suffix)), None)
+
+    def _build_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections alive between requests, like the real SWAPI
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests.append(self.path)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    self._respond()
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _respond(self) -> None:
+                status = server.failures.get(self.path)
+                if isinstance(status, list):
+                    with server._lock:
+                        status = status.pop(0) if status else None
+                if status:
+                    self._send_json(status, {"detail": "Simulated failure"})
+                    return
+                parsed = urlparse(self.path)
+                resource, _, item_id = parsed.path.strip("/").partition("/")
+                if item_id:
+                    payload = server.render_item(resource, item_id)
+                else:
+                    try:
+                        page = int(parse_qs(parsed.query).get("page", ["1"])[0])
+                    except ValueError:
+                        page = 0
+                    payload = server.render_page(resource, page)
+                if payload is None:
+                    self._send_json(404, {"detail": "Not found"})
+                    return
+                # Pages carry a content-derived ETag and honour If-None-Match, like a caching CDN in front of SWAPI
+                etag = '"%s"' % hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:32]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._send_json(200, payload, headers={"ETag": etag})
+
+            def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Keep test and benchmark output quiet
+                pass
+
+        return Handler
+
+
+def _serve_synthetic(characters: int, page_size: int, latency: float, seed: int, conn: Any) -> None:
+    with FakeSWAPIServer(synthetic_dataset(characters, seed=seed), page_size=page_size, latency=latency) as server:
+        conn.send(server.base_url)
+        # Serve until the parent asks us to stop (or goes away)
+        try:
+            conn.recv()
+        except EOFError:
+            pass
+
+
+class FakeSWAPIServerProcess:
+    """
+    Serves a synthetic dataset (see `synthetic_dataset`) from a FakeSWAPIServer in a child process, so rendering
+    pages neither competes with the code under test for the GIL nor shows up in its memory measurements.
+
+    Usage:
+        with FakeSWAPIServerProcess(characters=10_000) as server:
+            client.BASE_URL = server.base_url
+    """
+
+    def __init__(self, characters: int, page_size: int = 10, latency: float = 0.0, seed: int = 0) -> None:
+        self.args = (characters, page_size, latency, seed)
+        self.base_url = ""
+        self._conn: Any = None
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+
+    def __enter__(self) -> "FakeSWAPIServerProcess":
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve_synthetic, args=(*self.args, child_conn), daemon=True)
+        try:
+            self._process.start()
+            if not self._conn.poll(timeout=300):
+                raise RuntimeError("Fake SWAPI server process did not start")
+            self.base_url = self._conn.recv()
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        # Also called when __enter__ failed part-way, so the pipe or the process may be missing or dead
+        if self._conn is not None:
+            try:
+                self._conn.send("stop")
+            except OSError:
+                pass
+        if self._process is not None:
+            if self._process.pid is not None:
+                self._process.join(timeout=10)
+                if self._process.is_alive():
+                    self._process.terminate()
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
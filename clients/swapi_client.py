@@ -1,9 +1,17 @@
+import math
 import os
-from typing import Any
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Iterable, Iterator, Optional, Tuple
 
 import requests  # type: ignore
 
+from clients.utils.cache import HTTPCache
 from clients.utils.error_handling import swapi_client_error_handler
+from clients.utils.retry import RetryPolicy
+from clients.utils.stats import ClientStats, InstrumentedHTTPAdapter
+from clients.utils.throttling import CircuitBreaker, TokenBucket
 
 
 class SWAPIClient:
@@ -13,29 +21,208 @@ class SWAPIClient:
 
     BASE_URL = os.environ.get("SWAPI_BASE_URL", "https://swapi.dev/api")
 
-    def __init__(self, session: requests.Session = None, disable_ssl_verification: bool = False) -> None:
-        self.session = session or requests.Session()
+    def __init__(
+        self,
+        session: requests.Session = None,
+        disable_ssl_verification: bool = False,
+        max_workers: int = 1,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        pool_maxsize: int = 10,
+        accept_encoding: str = "gzip, deflate",
+        cache: Optional[HTTPCache] = None,
+    ) -> None:
+        self.stats = ClientStats()
+        # Connections kept alive per host; only the pool of a session built here can be resized
+        self.pool_maxsize = max(pool_maxsize, max_workers)
+        self._owns_session = session is None
+        self.session = session or self._build_session(self.pool_maxsize, accept_encoding)
         self.disable_ssl_verification = disable_ssl_verification
+        # Number of threads used to fetch pages concurrently; 1 keeps the sequential `next`-following path
+        self.max_workers = max_workers
+        # All three are optional and shared by every thread using this client
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=0)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        # Optional on-disk cache; cached pages are revalidated with If-None-Match / If-Modified-Since
+        self.cache = cache
+
+    def _build_session(self, pool_maxsize: int, accept_encoding: str) -> requests.Session:
+        """
+        Session whose connection pool is large enough for every fetching thread to keep its connection alive
+        (an undersized pool discards connections and pays a new TLS handshake), and which negotiates compression.
+        """
+        session = requests.Session()
+        self._mount_adapter(session, pool_maxsize)
+        session.headers["Accept-Encoding"] = accept_encoding
+        return session
+
+    def _mount_adapter(self, session: requests.Session, pool_maxsize: int) -> None:
+        adapter = InstrumentedHTTPAdapter(self.stats, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def ensure_pool_size(self, pool_maxsize: int) -> None:
+        """
+        Grow the connection pool to at least `pool_maxsize` connections, e.g. before several resources are
+        fetched at once with `max_workers` threads each. A session passed in by the caller is left alone.
+        """
+        if not self._owns_session or pool_maxsize <= self.pool_maxsize:
+            return
+        self.pool_maxsize = pool_maxsize
+        previous = self.session.get_adapter("https://")
+        self._mount_adapter(self.session, pool_maxsize)
+        previous.close()
 
     @swapi_client_error_handler
     def fetch_resource(self, resource: str, page: int = 1) -> dict:
         """Fetch a specific resource from SWAPI, paginated by page number."""
-        url = f"{self.BASE_URL}/{resource}/?page={page}"
-        resp = self.session.get(url, timeout=10, verify=not self.disable_ssl_verification)
+        return self._get_json(f"{self.BASE_URL}/{resource}/?page={page}")
+
+    @swapi_client_error_handler
+    def fetch_item(self, resource: str, item_id: str) -> dict:
+        """Fetch a single SWAPI item from its detail endpoint, e.g. `people/1/`."""
+        return self._get_json(f"{self.BASE_URL}/{resource}/{item_id}/")
+
+    def fetch_items(self, items: Iterable[Tuple[str, str]]) -> list[dict]:
+        """Fetch the detail endpoints of (resource, item id) pairs concurrently, returning payloads in order."""
+        items = list(items)
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [self.fetch_item(resource, item_id) for resource, item_id in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(lambda item: self.fetch_item(*item), items))
+
+    def _get_json(self, url: str) -> Any:
+        """GET `url` and decode its JSON body, revalidating against the HTTP cache when there is one."""
+        if self.cache is None:
+            resp = self._get(url)
+            resp.raise_for_status()
+            return resp.json()
+
+        entry = self.cache.get(url)
+        resp = self._get(url, headers=self.cache.conditional_headers(entry))
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self.stats.record_not_modified()
+            return entry["data"]
         resp.raise_for_status()
-        return resp.json()
+        data = resp.json()
+        self.cache.store(url, data, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return data
+
+    def _get(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """
+        GET `url` through the rate limiter and circuit breaker, retrying connection errors and retryable
+        statuses (429, 5xx) with jittered exponential backoff, or after `Retry-After` when upstream sends one.
+        """
+        attempt = 0
+        while True:
+            if self.circuit_breaker:
+                self.circuit_breaker.before_request()
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            try:
+                started_at = time.perf_counter()
+                resp = self.session.get(
+                    url, headers=headers or None, timeout=10, verify=not self.disable_ssl_verification
+                )
+                self._record_response(resp, time.perf_counter() - started_at)
+            except requests.exceptions.SSLError:
+                # A certificate problem will not fix itself on retry
+                self._record_upstream_failure()
+                raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record_upstream_failure()
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+                attempt += 1
+                time.sleep(self.retry_policy.delay(attempt))
+                continue
+            except Exception:
+                # Any other transport error (broken chunked body, bad encoding, redirect loop) still counts as a
+                # failed request, or a half-open circuit would wait forever for its trial to settle
+                self._record_upstream_failure()
+                raise
+
+            if resp.status_code not in self.retry_policy.status_codes:
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_success()
+                return resp
+
+            self._record_upstream_failure()
+            if attempt >= self.retry_policy.max_retries:
+                return resp
+            attempt += 1
+            time.sleep(self.retry_policy.delay(attempt, resp.headers.get("Retry-After")))
+
+    def _record_response(self, resp: requests.Response, latency: float) -> None:
+        # The body is already read (no streaming), so the raw stream position is the compressed size on the wire
+        bytes_decoded = len(resp.content)
+        bytes_received = resp.raw.tell() if resp.raw is not None else bytes_decoded
+        self.stats.record_response(latency, bytes_received, bytes_decoded)
+
+    def _record_upstream_failure(self) -> None:
+        if self.circuit_breaker:
+            self.circuit_breaker.record_failure()
 
     def fetch_all(self, resource: str) -> list[Any]:
         """Fetch all items for a SWAPI resource (all pages)."""
         results = []
-        page = 1
+        for _, items in self.iter_pages(resource):
+            results.extend(items)
+        return results
+
+    def iter_pages(self, resource: str, start_page: int = 1) -> Iterator[Tuple[int, list[Any]]]:
+        """
+        Yield (page number, items) for every page of a SWAPI resource, in page order, starting at `start_page`.
+        Only a bounded number of pages is held in memory at a time, so callers can stream large resources.
+        """
+        if self.max_workers > 1:
+            return self._iter_pages_concurrent(resource, start_page)
+        return self._iter_pages_sequential(resource, start_page)
+
+    def _iter_pages_sequential(self, resource: str, start_page: int = 1) -> Iterator[Tuple[int, list[Any]]]:
+        """Walk the pages one by one, following `next` until it is null."""
+        page = start_page
         while True:
             data = self.fetch_resource(resource, page=page)
-            results.extend(data.get("results", []))
+            yield page, data.get("results", [])
             if not data.get("next"):
                 break
             page += 1
-        return results
+
+    def _iter_pages_concurrent(self, resource: str, start_page: int = 1) -> Iterator[Tuple[int, list[Any]]]:
+        """
+        Read `count` and the page size from the first page, then fetch the remaining pages through a bounded
+        thread pool sharing `self.session`. At most `max_workers` pages are in flight or buffered at a time,
+        and pages are yielded in order.
+        """
+        first_page = self.fetch_resource(resource, page=start_page)
+        results = first_page.get("results", [])
+        yield start_page, results
+        if not first_page.get("next"):
+            return
+
+        count = first_page.get("count") or 0
+        page_size = len(results)
+        remaining_pages = range(start_page + 1, math.ceil(count / page_size) + 1) if page_size else range(0)
+        if not remaining_pages:
+            # Without a usable count or page size we cannot plan the pages, so fall back to following `next`
+            yield from self._iter_pages_sequential(resource, start_page=start_page + 1)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(remaining_pages))) as executor:
+            pending: Deque[Tuple[int, Future]] = deque()
+            for page in remaining_pages:
+                pending.append((page, executor.submit(self.fetch_resource, resource, page=page)))
+                if len(pending) >= self.max_workers:
+                    done_page, future = pending.popleft()
+                    yield done_page, future.result().get("results", [])
+            while pending:
+                done_page, future = pending.popleft()
+                yield done_page, future.result().get("results", [])
 
     def fetch_people(self) -> list[Any]:
         return self.fetch_all("people")
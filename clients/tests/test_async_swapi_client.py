@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+from unittest import TestCase
+from unittest.mock import patch
+
+from clients.async_swapi_client import AsyncSWAPIClient
+from clients.fake_server import FakeSWAPIServer
+
+from ..utils.exceptions import CircuitOpenError, SWAPIClientError
+from ..utils.retry import RetryPolicy
+from ..utils.throttling import CircuitBreaker
+
+
+def _people(count: int) -> list[dict]:
+    return [{"name": f"Person {index}", "url": f"https://swapi.dev/api/people/{index}/"} for index in range(count)]
+
+
+class TestAsyncSWAPIClient(TestCase):
+    def setUp(self) -> None:
+        self.server = FakeSWAPIServer(
+            {
+                "people": _people(25),
+                "films": [{"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}],
+                "starships": [{"name": "Death Star", "url": "https://swapi.dev/api/starships/9/"}],
+            },
+            failures={"/starships/?page=2": 503},
+        ).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(AsyncSWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+
+    def _run(
+        self, coroutine_factory: Callable[[AsyncSWAPIClient], Awaitable[Any]], max_concurrency: int = 8, **kwargs: Any
+    ) -> Any:
+        async def runner() -> Any:
+            async with AsyncSWAPIClient(max_concurrency=max_concurrency, **kwargs) as client:
+                return await coroutine_factory(client)
+
+        return asyncio.run(runner())
+
+    def test_fetch_people_returns_all_pages_in_order(self) -> None:
+        result = self._run(lambda client: client.fetch_people())
+
+        self.assertEqual([person["name"] for person in result], [f"Person {index}" for index in range(25)])
+        self.assertEqual(sorted(self.server.requests), ["/people/?page=1", "/people/?page=2", "/people/?page=3"])
+
+    def test_fetch_everything_bounds_concurrency(self) -> None:
+        self.server.dataset["starships"] = [{"name": "Death Star"}]
+        self.server.latency = 0.05
+
+        result = self._run(lambda client: client.fetch_everything(), max_concurrency=2)
+
+        self.assertEqual(len(result["people"]), 25)
+        self.assertEqual(result["films"][0]["title"], "A New Hope")
+        self.assertEqual(result["starships"][0]["name"], "Death Star")
+        self.assertEqual(self.server.max_in_flight, 2)
+
+    def test_fetch_resource_not_found_raises_swapi_client_error(self) -> None:
+        with self.assertRaises(SWAPIClientError) as exc:
+            self._run(lambda client: client.fetch_resource("vehicles"))
+
+        self.assertEqual(exc.exception.status_code, 404)
+        self.assertEqual(exc.exception.reason, "Not Found")
+        self.assertEqual(exc.exception.message, "SWAPI request failed: Not Found")
+
+    def test_failing_page_raises_swapi_client_error(self) -> None:
+        self.server.dataset["starships"] = [{"name": f"Ship {index}"} for index in range(15)]
+
+        with self.assertRaises(SWAPIClientError) as exc:
+            self._run(lambda client: client.fetch_starships())
+
+        self.assertEqual(exc.exception.status_code, 503)
+        self.assertEqual(exc.exception.reason, "Service Unavailable")
+
+    def test_connection_error_raises_swapi_client_error(self) -> None:
+        self.server.stop()
+
+        with self.assertRaises(SWAPIClientError) as exc:
+            self._run(lambda client: client.fetch_films())
+
+        self.assertIsNone(exc.exception.status_code)
+        self.assertEqual(exc.exception.reason, "No response received")
+
+    def test_retries_retryable_statuses(self) -> None:
+        self.server.dataset["starships"] = [{"name": f"Ship {index}"} for index in range(15)]
+        self.server.failures["/starships/?page=2"] = [503]
+
+        result = self._run(lambda client: client.fetch_starships(), retry_policy=RetryPolicy(base_delay=0))
+
+        self.assertEqual(len(result), 15)
+        self.assertEqual(self.server.requests.count("/starships/?page=2"), 2)
+
+    def test_open_circuit_fails_fast(self) -> None:
+        self.server.failures["/films/?page=1"] = 503
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+        with self.assertRaises(SWAPIClientError):
+            self._run(lambda client: client.fetch_films(), circuit_breaker=breaker)
+        with self.assertRaises(CircuitOpenError):
+            self._run(lambda client: client.fetch_films(), circuit_breaker=breaker)
+
+        self.assertEqual(self.server.requests.count("/films/?page=1"), 1)
@@ -1,11 +1,20 @@
+import json
+import os
+import shutil
+import tempfile
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
 import requests.exceptions  # type: ignore
 
+from clients.fake_server import FakeSWAPIServer
 from clients.swapi_client import SWAPIClient
 
-from ..utils.exceptions import SWAPIClientError
+from ..utils.cache import HTTPCache
+from ..utils.exceptions import CircuitOpenError, SWAPIClientError
+from ..utils.retry import RetryPolicy
+from ..utils.stats import InstrumentedHTTPAdapter
+from ..utils.throttling import CircuitBreaker, TokenBucket
 
 
 class TestSWAPIClient(TestCase):
@@ -17,6 +26,8 @@ class TestSWAPIClient(TestCase):
         mock_resp = Mock()
         mock_resp.status_code = status
         mock_resp.json.return_value = content or {}
+        mock_resp.content = json.dumps(content or {}).encode()
+        mock_resp.raw = None
         if raise_error:
             mock_resp.raise_for_status.side_effect = Exception("Mocked error")
         return mock_resp
@@ -28,7 +39,7 @@ class TestSWAPIClient(TestCase):
 
         result = self.client.fetch_films()
 
-        mock_get.assert_called_once_with(f"{self.base_url}/films/?page=1", timeout=10, verify=False)
+        mock_get.assert_called_once_with(f"{self.base_url}/films/?page=1", headers=None, timeout=10, verify=False)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["title"], "A New Hope")
 
@@ -39,7 +50,7 @@ class TestSWAPIClient(TestCase):
 
         result = self.client.fetch_people()
 
-        mock_get.assert_called_once_with(f"{self.base_url}/people/?page=1", timeout=10, verify=False)
+        mock_get.assert_called_once_with(f"{self.base_url}/people/?page=1", headers=None, timeout=10, verify=False)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["name"], "Luke Skywalker")
 
@@ -58,7 +69,7 @@ class TestSWAPIClient(TestCase):
 
         result = self.client.fetch_starships()
 
-        mock_get.assert_called_once_with(f"{self.base_url}/starships/?page=1", timeout=10, verify=False)
+        mock_get.assert_called_once_with(f"{self.base_url}/starships/?page=1", headers=None, timeout=10, verify=False)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["name"], "Death Star")
 
@@ -120,3 +131,334 @@ class TestSWAPIClient(TestCase):
         self.assertEqual(exc.exception.message, "SWAPI request failed with SSL Error: SSL verification failed")
         self.assertIsNone(exc.exception.status_code)
         self.assertIsNone(exc.exception.reason)
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_fetch_all_concurrent_returns_pages_in_order(self, mock_get: Mock) -> None:
+        pages = {
+            page: {
+                "count": 5,
+                "next": f"{self.base_url}/people/?page={page + 1}" if page < 3 else None,
+                "results": [{"name": f"Person {index}"} for index in range((page - 1) * 2, min(page * 2, 5))],
+            }
+            for page in range(1, 4)
+        }
+        mock_get.side_effect = lambda url, **kwargs: self._mock_response(content=pages[int(url.split("=")[-1])])
+        self.client.max_workers = 4
+
+        result = self.client.fetch_people()
+
+        self.assertEqual([person["name"] for person in result], [f"Person {index}" for index in range(5)])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_fetch_all_concurrent_falls_back_to_next_links_without_count(self, mock_get: Mock) -> None:
+        pages: dict[int, dict] = {
+            1: {"next": f"{self.base_url}/films/?page=2", "results": [{"title": "A New Hope"}]},
+            2: {"next": None, "results": [{"title": "The Empire Strikes Back"}]},
+        }
+        mock_get.side_effect = lambda url, **kwargs: self._mock_response(content=pages[int(url.split("=")[-1])])
+        self.client.max_workers = 4
+
+        result = self.client.fetch_films()
+
+        self.assertEqual([film["title"] for film in result], ["A New Hope", "The Empire Strikes Back"])
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_fetch_all_concurrent_propagates_page_errors(self, mock_get: Mock) -> None:
+        first_page = {"count": 20, "next": f"{self.base_url}/starships/?page=2", "results": [{}] * 10}
+
+        def get(url: str, **kwargs: dict) -> Mock:
+            if url.endswith("page=1"):
+                return self._mock_response(content=first_page)
+            raise requests.exceptions.HTTPError(response=Mock(status_code=502, reason="Bad Gateway"))
+
+        mock_get.side_effect = get
+        self.client.max_workers = 4
+
+        with self.assertRaises(SWAPIClientError) as exc:
+            self.client.fetch_starships()
+
+        self.assertEqual(exc.exception.status_code, 502)
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_iter_pages_yields_page_numbers_from_start_page(self, mock_get: Mock) -> None:
+        pages = {
+            page: {
+                "count": 40,
+                "next": f"{self.base_url}/people/?page={page + 1}" if page < 4 else None,
+                "results": [{"name": f"Person {page}.{index}"} for index in range(10)],
+            }
+            for page in range(1, 5)
+        }
+        mock_get.side_effect = lambda url, **kwargs: self._mock_response(content=pages[int(url.split("=")[-1])])
+
+        for max_workers in (1, 2):
+            self.client.max_workers = max_workers
+            result = list(self.client.iter_pages("people", start_page=2))
+
+            self.assertEqual([page for page, _ in result], [2, 3, 4])
+            self.assertEqual(result[0][1][0]["name"], "Person 2.0")
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_error_status_is_kept_for_falsy_responses(self, mock_get: Mock) -> None:
+        response = requests.Response()
+        response.status_code, response.reason = 404, "Not Found"
+        mock_get.side_effect = requests.exceptions.HTTPError(response=response)
+
+        with self.assertRaises(SWAPIClientError) as exc:
+            self.client.fetch_films()
+
+        self.assertEqual(exc.exception.status_code, 404)
+        self.assertEqual(exc.exception.reason, "Not Found")
+
+
+class TestSWAPIClientResilience(TestCase):
+    def setUp(self) -> None:
+        self.base_url = "https://swapi.dev/api"
+        sleep_patcher = patch("clients.swapi_client.time.sleep")
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def _response(self, status: int, headers: dict = None) -> Mock:
+        resp = Mock(status_code=status, headers=headers or {}, content=b"{}", raw=None)
+        resp.json.return_value = {"results": [{"title": "A New Hope"}]}
+        if status >= 400:
+            resp.raise_for_status.side_effect = requests.exceptions.HTTPError(
+                response=Mock(status_code=status, reason="Upstream Error")
+            )
+        return resp
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_retries_retryable_statuses_then_succeeds(self, mock_get: Mock) -> None:
+        client = SWAPIClient(retry_policy=RetryPolicy(max_retries=3, base_delay=0.5))
+        mock_get.side_effect = [self._response(503), self._response(502), self._response(200)]
+
+        result = client.fetch_films()
+
+        self.assertEqual(result[0]["title"], "A New Hope")
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(self.sleep.call_count, 2)
+        self.assertTrue(all(0 <= call.args[0] <= 1.0 for call in self.sleep.call_args_list))
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_honours_retry_after_header(self, mock_get: Mock) -> None:
+        client = SWAPIClient(retry_policy=RetryPolicy(max_retries=1))
+        mock_get.side_effect = [self._response(429, {"Retry-After": "7"}), self._response(200)]
+
+        client.fetch_films()
+
+        self.sleep.assert_called_once_with(7.0)
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_gives_up_after_max_retries(self, mock_get: Mock) -> None:
+        client = SWAPIClient(retry_policy=RetryPolicy(max_retries=2))
+        mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
+
+        with self.assertRaises(SWAPIClientError) as exc:
+            client.fetch_films()
+
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(exc.exception.reason, "No response received")
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_does_not_retry_client_errors(self, mock_get: Mock) -> None:
+        client = SWAPIClient(retry_policy=RetryPolicy(max_retries=3))
+        mock_get.return_value = self._response(404)
+
+        with self.assertRaises(SWAPIClientError) as exc:
+            client.fetch_films()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(exc.exception.status_code, 404)
+
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_circuit_breaker_fails_fast_while_open(self, mock_get: Mock) -> None:
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        client = SWAPIClient(circuit_breaker=breaker)
+        mock_get.return_value = self._response(500)
+
+        for _ in range(2):
+            with self.assertRaises(SWAPIClientError):
+                client.fetch_films()
+        with self.assertRaises(CircuitOpenError):
+            client.fetch_films()
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    @patch("clients.utils.throttling.time.monotonic")
+    def test_circuit_breaker_half_opens_after_reset_timeout(self, monotonic: Mock) -> None:
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+
+        monotonic.return_value = 131.0
+        breaker.before_request()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @patch("clients.utils.throttling.time.sleep")
+    @patch("clients.utils.throttling.time.monotonic")
+    def test_token_bucket_waits_once_burst_is_spent(self, monotonic: Mock, sleep: Mock) -> None:
+        clock = [0.0]
+        monotonic.side_effect = lambda: clock[0]
+        sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        bucket = TokenBucket(rate=2, capacity=2)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertAlmostEqual(clock[0], 1.0)
+
+    @patch("clients.utils.throttling.time.sleep")
+    @patch("clients.utils.throttling.time.monotonic")
+    def test_token_bucket_below_one_request_per_second(self, monotonic: Mock, sleep: Mock) -> None:
+        clock = [0.0]
+        monotonic.side_effect = lambda: clock[0]
+        sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        bucket = TokenBucket(rate=0.5)
+
+        for _ in range(2):
+            bucket.acquire()
+
+        self.assertAlmostEqual(clock[0], 2.0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    @patch("clients.utils.throttling.time.monotonic")
+    @patch("clients.swapi_client.requests.Session.get")
+    def test_failed_half_open_trial_reopens_the_circuit(self, mock_get: Mock, monotonic: Mock) -> None:
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        monotonic.return_value = 131.0
+        client = SWAPIClient(circuit_breaker=breaker)
+        mock_get.side_effect = requests.exceptions.ChunkedEncodingError("Connection broken")
+
+        with self.assertRaises(SWAPIClientError):
+            client.fetch_films()
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+class TestSWAPIClientTransport(TestCase):
+    def setUp(self) -> None:
+        people = [{"name": f"Person {index}", "height": "172", "mass": "77"} for index in range(30)]
+        self.server = FakeSWAPIServer({"people": people}).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+
+    def test_stats_count_reused_connections_and_compressed_bytes(self) -> None:
+        client = SWAPIClient()
+
+        client.fetch_people()
+
+        stats = client.stats.snapshot()
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["new_connections"], 1)
+        self.assertEqual(stats["reused_connections"], 2)
+        self.assertLess(stats["bytes_received"], stats["bytes_decoded"])
+        self.assertGreater(stats["latency_max_ms"], 0)
+
+    def test_pool_is_sized_for_concurrent_workers(self) -> None:
+        client = SWAPIClient(max_workers=16)
+
+        adapter = client.session.get_adapter(self.server.base_url)
+        assert isinstance(adapter, InstrumentedHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(client.session.headers["Accept-Encoding"], "gzip, deflate")
+
+    def test_pool_grows_but_never_shrinks_or_touches_a_caller_session(self) -> None:
+        client = SWAPIClient(max_workers=4, pool_maxsize=4)
+        client.ensure_pool_size(12)
+        client.ensure_pool_size(6)
+
+        adapter = client.session.get_adapter(self.server.base_url)
+        assert isinstance(adapter, InstrumentedHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 12)
+        self.assertIs(adapter.stats, client.stats)
+
+        session = requests.Session()
+        caller_adapter = session.get_adapter(self.server.base_url)
+        SWAPIClient(session=session).ensure_pool_size(12)
+        self.assertIs(session.get_adapter(self.server.base_url), caller_adapter)
+
+
+class TestSWAPIClientHTTPCache(TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        films = [{"title": f"Film {index}"} for index in range(15)]
+        self.server = FakeSWAPIServer({"films": films}).start()
+        self.addCleanup(self.server.stop)
+        base_url_patcher = patch.object(SWAPIClient, "BASE_URL", self.server.base_url)
+        base_url_patcher.start()
+        self.addCleanup(base_url_patcher.stop)
+
+    def test_revalidates_cached_pages_and_reuses_them_on_304(self) -> None:
+        first = SWAPIClient(cache=HTTPCache(self.cache_dir)).fetch_films()
+
+        client = SWAPIClient(cache=HTTPCache(self.cache_dir))
+        second = client.fetch_films()
+
+        self.assertEqual(second, first)
+        self.assertEqual(client.stats.snapshot()["not_modified"], 2)
+        self.assertEqual(client.stats.snapshot()["bytes_decoded"], 0)
+
+    def test_changed_page_is_downloaded_again(self) -> None:
+        SWAPIClient(cache=HTTPCache(self.cache_dir)).fetch_films()
+        self.server.dataset["films"][12] = {"title": "Film 12 (remastered)"}
+
+        client = SWAPIClient(cache=HTTPCache(self.cache_dir))
+        films = client.fetch_films()
+
+        self.assertEqual(films[12], {"title": "Film 12 (remastered)"})
+        self.assertEqual(client.stats.snapshot()["not_modified"], 1)
+
+    @patch("requests.Session.get")
+    def test_sends_last_modified_validator(self, mock_get: Mock) -> None:
+        cache = HTTPCache(self.cache_dir)
+        url = f"{self.server.base_url}/films/?page=1"
+        cache.store(url, {"results": []}, etag=None, last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+        mock_get.return_value = Mock(status_code=304, headers={}, content=b"", raw=None)
+
+        data = SWAPIClient(cache=cache).fetch_resource("films")
+
+        self.assertEqual(data, {"results": []})
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+    def test_evicts_expired_and_least_recently_validated_entries(self) -> None:
+        cache = HTTPCache(self.cache_dir)
+        for index in range(3):
+            cache.store(f"http://swapi/films/?page={index}", {"index": index}, etag=f'"{index}"', last_modified=None)
+            os.utime(cache._path(f"http://swapi/films/?page={index}"), (1000 + index, 1000 + index))
+        entry_size = os.path.getsize(cache._path("http://swapi/films/?page=0"))
+
+        cache = HTTPCache(self.cache_dir, max_bytes=2 * entry_size)
+
+        self.assertIsNone(cache.get("http://swapi/films/?page=0"))
+        self.assertEqual((cache.get("http://swapi/films/?page=2") or {}).get("data"), {"index": 2})
+
+        cache = HTTPCache(self.cache_dir, max_age=60)
+
+        self.assertIsNone(cache.get("http://swapi/films/?page=2"))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_fetch_items_fetches_detail_endpoints_concurrently_in_order(self) -> None:
+        self.server.dataset["people"] = [
+            {"name": f"Person {index}", "url": f"https://swapi.dev/api/people/{index}/"} for index in range(1, 6)
+        ]
+        self.server.latency = 0.05
+        client = SWAPIClient(max_workers=4)
+
+        people = client.fetch_items([("people", "5"), ("people", "2"), ("people", "3"), ("people", "1")])
+
+        self.assertEqual([person["name"] for person in people], ["Person 5", "Person 2", "Person 3", "Person 1"])
+        self.assertEqual(self.server.max_in_flight, 4)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class HTTPCache:
+    """
+    On-disk cache of SWAPI responses keyed by URL, used for conditional revalidation.
+
+    Each entry is one JSON file holding the decoded body together with the `ETag` and `Last-Modified` headers it
+    was served with. The file's mtime records when the entry was last stored or revalidated: entries older than
+    `max_age` seconds are dropped, and once the directory grows past `max_bytes` the least recently validated
+    entries are evicted first. Safe to share between the threads of one client.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None, max_age: Optional[float] = None) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = 0
+        self.evict()
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for `url`, or None if there is none or it has expired."""
+        path = self._path(url)
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+                self._remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # Missing, evicted by another thread, or truncated: treat it as a miss
+            return None
+        return entry if entry.get("url") == url else None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Request headers asking upstream to answer 304 if `entry` is still current."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, data: Any, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Cache `data` for `url`. Responses without a validator cannot be revalidated and are not stored."""
+        if not etag and not last_modified:
+            return
+        body = json.dumps({"url": url, "etag": etag, "last_modified": last_modified, "data": data}).encode()
+        path = self._path(url)
+        # Write to a temporary file and rename it so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        with self._lock:
+            self._size -= self._file_size(path)
+            os.replace(tmp_path, path)
+            self._size += len(body)
+            over_budget = self.max_bytes is not None and self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def touch(self, url: str) -> None:
+        """Mark the entry for `url` as freshly revalidated (upstream answered 304)."""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently validated ones until the cache fits in `max_bytes`."""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                    self._remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            self._size = sum(size for _, size, _ in entries)
+            if self.max_bytes is None:
+                return
+            for _, size, path in sorted(entries):
+                if self._size <= self.max_bytes:
+                    break
+                self._remove(path)
+                self._size -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    self._remove(os.path.join(self.directory, name))
+            self._size = 0
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
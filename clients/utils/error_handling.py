@@ -1,6 +1,8 @@
+import ssl
 from functools import wraps
 from typing import Any
 
+import httpx
 from requests.exceptions import RequestException, SSLError  # type: ignore
 
 from .exceptions import SWAPIClientError
@@ -16,15 +18,57 @@ def swapi_client_error_handler(func):  # type: ignore
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         try:
             return func(*args, **kwargs)
+        except SWAPIClientError:
+            # Already descriptive, e.g. CircuitOpenError
+            raise
         except SSLError as ssl_exc:
             raise SWAPIClientError(f"SWAPI request failed with SSL Error: {ssl_exc}") from ssl_exc
         except RequestException as exc:
+            # A Response is falsy for 4xx/5xx statuses, so compare against None rather than testing truthiness
+            response = exc.response
             raise SWAPIClientError(
-                f"SWAPI request failed: {exc.response.reason if exc.response else 'No response received'}",
-                status_code=exc.response.status_code if exc.response else None,
-                reason=exc.response.reason if exc.response else "No response received",
+                f"SWAPI request failed: {response.reason if response is not None else 'No response received'}",
+                status_code=response.status_code if response is not None else None,
+                reason=response.reason if response is not None else "No response received",
             ) from exc
         except Exception as exc:
             raise SWAPIClientError(f"Unexpected error during SWAPI call: {exc}") from exc
 
     return wrapper
+
+
+def _caused_by_ssl_error(exc: BaseException) -> bool:
+    """httpx wraps SSL failures in ConnectError, so walk the exception chain looking for an ssl.SSLError."""
+    while exc is not None:
+        if isinstance(exc, ssl.SSLError):
+            return True
+        exc = exc.__cause__ or exc.__context__  # type: ignore
+    return False
+
+
+def async_swapi_client_error_handler(func):  # type: ignore
+    """
+    Decorator to handle errors for AsyncSWAPIClient coroutines.
+    Mirrors swapi_client_error_handler for httpx exceptions, so both clients raise the same SWAPIClientError.
+    """
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await func(*args, **kwargs)
+        except SWAPIClientError:
+            raise
+        except httpx.HTTPStatusError as exc:
+            raise SWAPIClientError(
+                f"SWAPI request failed: {exc.response.reason_phrase}",
+                status_code=exc.response.status_code,
+                reason=exc.response.reason_phrase,
+            ) from exc
+        except httpx.RequestError as exc:
+            if _caused_by_ssl_error(exc):
+                raise SWAPIClientError(f"SWAPI request failed with SSL Error: {exc}") from exc
+            raise SWAPIClientError("SWAPI request failed: No response received", reason="No response received") from exc
+        except Exception as exc:
+            raise SWAPIClientError(f"Unexpected error during SWAPI call: {exc}") from exc
+
+    return wrapper
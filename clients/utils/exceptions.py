@@ -11,3 +11,11 @@ class SWAPIClientError(Exception):
         status_info = f" (Status: {self.status_code})" if self.status_code else ""
         reason_info = f" (Reason: {self.reason})" if self.reason else ""
         return f"SWAPIClientError: {self.message}{status_info}{reason_info}"
+
+
+class CircuitOpenError(SWAPIClientError):
+    """Raised without contacting SWAPI while the circuit breaker is open after repeated upstream failures."""
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"SWAPI circuit breaker is open, retry in {retry_in:.1f}s", reason="Circuit open")
+        self.retry_in = retry_in
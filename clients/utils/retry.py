@@ -0,0 +1,56 @@
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+from .exceptions import CircuitOpenError, SWAPIClientError
+
+# Upstream statuses worth retrying: throttling and server-side failures
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_transient_error(exc: SWAPIClientError) -> bool:
+    """
+    A failure is transient if no response was received or upstream answered with a retryable status.
+    An open circuit breaker is not: retrying it would only hammer a degraded upstream sooner.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    return exc.status_code is None or exc.status_code in RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 30.0) -> float:
+    """Exponential backoff with full jitter: a random delay in [0, min(max_delay, base_delay * 2 ** (attempt - 1))]."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait according to a `Retry-After` header, given either as delta-seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How many times, and after how long, a failed SWAPI request is retried."""
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before retry number `attempt` (1-based); a `Retry-After` header takes precedence over backoff."""
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_delay)
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
@@ -0,0 +1,110 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class ClientStats:
+    """
+    Thread-safe transport counters for a SWAPIClient: requests, new vs reused connections, bytes transferred
+    and per-request latency. Read them with `snapshot()` after a sync.
+    """
+
+    # Latencies of the most recent requests kept for percentiles
+    LATENCY_WINDOW = 1000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.not_modified = 0  # cached pages revalidated with a 304 instead of re-downloaded
+            self.new_connections = 0
+            self.bytes_received = 0  # as sent on the wire, i.e. compressed
+            self.bytes_decoded = 0
+            self.total_latency = 0.0
+            self.max_latency = 0.0
+            self.latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    def record_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def record_response(self, latency: float, bytes_received: int, bytes_decoded: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += bytes_received
+            self.bytes_decoded += bytes_decoded
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.latencies.append(latency)
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            return {
+                "requests": self.requests,
+                "not_modified": self.not_modified,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "bytes_received": self.bytes_received,
+                "bytes_decoded": self.bytes_decoded,
+                "latency_avg_ms": round(1000 * self.total_latency / self.requests, 2) if self.requests else 0.0,
+                "latency_p95_ms": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else 0.0,
+                "latency_max_ms": round(1000 * self.max_latency, 2),
+            }
+
+    def __str__(self) -> str:
+        snapshot = self.snapshot()
+        return (
+            f"{snapshot['requests']} requests ({snapshot['not_modified']} not modified), "
+            f"{snapshot['new_connections']} new / "
+            f"{snapshot['reused_connections']} reused connections, {snapshot['bytes_received']} bytes received "
+            f"({snapshot['bytes_decoded']} decoded), latency avg {snapshot['latency_avg_ms']}ms "
+            f"p95 {snapshot['latency_p95_ms']}ms max {snapshot['latency_max_ms']}ms"
+        )
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection (TCP + TLS handshake) to `stats`."""
+
+    def __init__(self, stats: ClientStats, **kwargs: Any) -> None:
+        self.stats = stats
+        self._pool_classes = self._counting_pool_classes(stats)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+    def proxy_manager_for(self, *args: Any, **kwargs: Any) -> Any:
+        # Connections opened through an egress proxy are counted as well
+        manager = super().proxy_manager_for(*args, **kwargs)
+        manager.pool_classes_by_scheme = self._pool_classes
+        return manager
+
+    @staticmethod
+    def _counting_pool_classes(stats: ClientStats) -> Dict[str, type]:
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self) -> Any:
+                stats.record_new_connection()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self) -> Any:
+                stats.record_new_connection()
+                return super()._new_conn()
+
+        return {"http": CountingHTTPConnectionPool, "https": CountingHTTPSConnectionPool}
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from .exceptions import CircuitOpenError
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting requests to `rate` per second, with bursts of up to `capacity`.
+    One bucket is shared by every thread fetching through the same client.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"TokenBucket rate must be positive, got {rate}")
+        self.rate = rate
+        # A bucket that cannot hold one whole token would never hand one out
+        self.capacity = max(1.0, capacity or rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Like acquire(), but waits with asyncio.sleep so the event loop keeps running."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def _take(self) -> float:
+        """Take a token and return 0, or return how long to wait before one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker. After `failure_threshold` consecutive upstream failures the circuit opens and
+    requests fail fast with CircuitOpenError. After `reset_timeout` seconds a single trial request is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if the request must not reach upstream."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and retry_in <= 0:
+                # Let this request through as the trial; concurrent requests keep failing fast until it settles
+                self.state = self.HALF_OPEN
+                return
+            raise CircuitOpenError(retry_in=max(retry_in, 0.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -100,6 +100,23 @@ if "test" in sys.argv or "test_coverage" in sys.argv or not os.environ.get("POST
         "NAME": BASE_DIR / "db.sqlite3",  # type: ignore
     }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/ref/settings/#caches
+# Local memory (the default) is private to each process. Set CACHE_BACKEND to a backend every process shares, e.g.
+# django.core.cache.backends.filebased.FileBasedCache with a directory as CACHE_LOCATION, Redis or Memcached
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+# The list caches below are only coherent when invalidations reach every process, so they default to off otherwise
+shared_cache = CACHES["default"]["BACKEND"] not in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -160,3 +177,43 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
     "SERVE_AUTHENTICATION": ["rest_framework.authentication.TokenAuthentication"],
 }
+
+# List endpoint settings
+# Seconds a cached list total (total_items / total_pages) may be served (0 = disabled, the default without a shared
+# cache); syncs invalidate them earlier
+API_LIST_COUNT_CACHE_TIMEOUT = int(os.environ.get("API_LIST_COUNT_CACHE_TIMEOUT", "300" if shared_cache else "0"))
+# On PostgreSQL, report planner estimates instead of COUNT(*) for unfiltered lists (flagged as estimated)
+API_LIST_COUNT_ESTIMATE = os.environ.get("API_LIST_COUNT_ESTIMATE", "false").lower() in ("1", "true", "yes")
+# Seconds a list response may be served from the cache (0 = disabled, the default without a shared cache); syncs
+# and votes invalidate it earlier
+API_RESPONSE_CACHE_TIMEOUT = int(os.environ.get("API_RESPONSE_CACHE_TIMEOUT", "300" if shared_cache else "0"))
+
+# SWAPI sync settings
+# Number of threads used to fetch SWAPI pages concurrently (1 = sequential)
+SWAPI_FETCH_WORKERS = int(os.environ.get("SWAPI_FETCH_WORKERS", "8"))
+# Maximum time (ms) the sync apply transaction waits for row locks on PostgreSQL (0 = wait indefinitely)
+SWAPI_SYNC_LOCK_TIMEOUT_MS = int(os.environ.get("SWAPI_SYNC_LOCK_TIMEOUT_MS", "5000"))
+# Number of rows written per upsert statement during a SWAPI sync
+SWAPI_SYNC_BATCH_SIZE = int(os.environ.get("SWAPI_SYNC_BATCH_SIZE", "500"))
+# Retries and base backoff (seconds) for SWAPI pages that fail transiently during a streaming sync
+SWAPI_PAGE_RETRIES = int(os.environ.get("SWAPI_PAGE_RETRIES", "3"))
+SWAPI_RETRY_BACKOFF = float(os.environ.get("SWAPI_RETRY_BACKOFF", "1.0"))
+# Retries per SWAPI request on connection errors, 429 and 5xx (backoff base is SWAPI_RETRY_BACKOFF)
+SWAPI_MAX_RETRIES = int(os.environ.get("SWAPI_MAX_RETRIES", "3"))
+# Client-side rate limit shared by all fetching threads, in requests per second (0 = unlimited)
+SWAPI_RATE_LIMIT = float(os.environ.get("SWAPI_RATE_LIMIT", "10"))
+SWAPI_RATE_BURST = float(os.environ.get("SWAPI_RATE_BURST", "10"))
+# Consecutive upstream failures that open the circuit breaker (0 = disabled), and seconds before a trial request
+SWAPI_CIRCUIT_BREAKER_THRESHOLD = int(os.environ.get("SWAPI_CIRCUIT_BREAKER_THRESHOLD", "5"))
+SWAPI_CIRCUIT_BREAKER_RESET = float(os.environ.get("SWAPI_CIRCUIT_BREAKER_RESET", "30"))
+# Keep-alive connections per host in the SWAPI client pool (raised to SWAPI_FETCH_WORKERS, or three times that
+# for `fetch_swapi --parallel`, if lower)
+SWAPI_POOL_MAXSIZE = int(os.environ.get("SWAPI_POOL_MAXSIZE", "10"))
+# On-disk cache of SWAPI pages revalidated with ETag / Last-Modified ("" = disabled), evicted by size and age
+SWAPI_HTTP_CACHE_DIR = os.environ.get("SWAPI_HTTP_CACHE_DIR", "")
+SWAPI_HTTP_CACHE_MAX_BYTES = int(os.environ.get("SWAPI_HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+SWAPI_HTTP_CACHE_MAX_AGE = float(os.environ.get("SWAPI_HTTP_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+# Seconds between runs of the sync_worker command, and how long its sync lease lasts on databases without
+# advisory locks (must exceed the longest sync, or a second node may start before the first one finishes)
+SWAPI_SYNC_INTERVAL = float(os.environ.get("SWAPI_SYNC_INTERVAL", "3600"))
+SWAPI_SYNC_LEASE_SECONDS = float(os.environ.get("SWAPI_SYNC_LEASE_SECONDS", "3600"))